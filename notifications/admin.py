@@ -1,15 +1,73 @@
+from django.conf import settings
 from django.contrib import admin
+from django.db.models import Q
 
-from .models import NotificationLog
+from .models import NotificationLog, OutboxMessage, RecipientProfile, SuppressionEntry
+from .paginators import EstimatedCountPaginator
+
+# Режим для больших таблиц: оценка числа строк, без date_hierarchy и фильтров,
+# требующих DISTINCT по всей таблице, поиск по индексам
+ADMIN_FAST_MODE = getattr(settings, 'NOTIFICATION_ADMIN_FAST_MODE', False)
 
 
 @admin.register(NotificationLog)
 class NotificationLogAdmin(admin.ModelAdmin):
-    list_display = ['id', 'title', 'channel_used', 'status', 'email', 'phone', 'created_at']
-    list_filter = ['channel_used', 'status', 'created_at']
+    list_display = [
+        'id', 'title', 'channel_used', 'status', 'delivery_status', 'email', 'phone', 'created_at'
+    ]
     search_fields = ['title', 'message', 'email', 'phone', 'telegram_chat_id']
+    readonly_fields = ['created_at', 'provider_message_id', 'provider_account', 'delivery_updated_at']
+
+    if ADMIN_FAST_MODE:
+        list_filter = ['channel_used', 'status', 'outcome', 'delivery_status']
+        paginator = EstimatedCountPaginator
+        show_full_result_count = False
+    else:
+        list_filter = ['channel_used', 'status', 'outcome', 'delivery_status', 'provider_account', 'created_at']
+        date_hierarchy = 'created_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_search_results(self, request, queryset, search_term):
+        """Точное совпадение по контактам, по тексту - через триграммный индекс"""
+        if not ADMIN_FAST_MODE:
+            return super().get_search_results(request, queryset, search_term)
+
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+
+        condition = Q(email=term) | Q(phone=term) | Q(telegram_chat_id=term)
+        # icontains дает UPPER(...) LIKE, его обслуживают триграммные индексы по Upper(title/message);
+        # они работают с подстроками от трех символов
+        if len(term) >= 3:
+            condition |= Q(title__icontains=term) | Q(message__icontains=term)
+        return queryset.filter(condition), False
+
+
+@admin.register(RecipientProfile)
+class RecipientProfileAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'email', 'phone', 'telegram_chat_id', 'channel_order',
+        'opted_out_channels', 'timezone', 'quiet_hours_start', 'quiet_hours_end'
+    ]
+    search_fields = ['email', 'phone', 'telegram_chat_id']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(SuppressionEntry)
+class SuppressionEntryAdmin(admin.ModelAdmin):
+    list_display = ['id', 'channel', 'contact', 'reason', 'created_at']
+    list_filter = ['channel', 'reason']
+    search_fields = ['contact']
     readonly_fields = ['created_at']
-    date_hierarchy = 'created_at'
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task_name', 'task_id', 'attempts', 'created_at']
+    readonly_fields = ['task_id', 'task_name', 'kwargs', 'attempts', 'last_error', 'created_at']
 
     def has_add_permission(self, request):
-        return False
\ No newline at end of file
+        return False
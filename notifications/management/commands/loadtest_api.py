@@ -0,0 +1,253 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from rest_framework.serializers import Serializer
+from rest_framework.views import APIView
+
+from notifications.models import NotificationLog, OutboxMessage
+from notifications.services import outbox
+from notifications.services.notification_service import NotificationService
+from system_notification.celery import app as celery_app
+
+
+ENDPOINTS = {
+    'send': '/api/notifications/v1/send/',
+    'send-bulk': '/api/notifications/v1/send/',
+    'send-async': '/api/notifications/v1/send-async/',
+    'send-async-bulk': '/api/notifications/v1/send-async/',
+}
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """Заглушка SMS.ru и Telegram Bot API: всегда успешный ответ"""
+
+    def _reply(self):
+        if '/sms/send' in self.path:
+            body = {'status': 'OK', 'sms': {'stub': {'status': 'OK', 'sms_id': uuid.uuid4().hex}}}
+        else:
+            body = {'ok': True, 'result': {'message_id': int(time.time() * 1000)}}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StageTimer:
+    """Время по этапам запроса: аутентификация, сериализатор, сервис, outbox, БД"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def start_request(self):
+        self._local.stages = {}
+        self._local.queries = 0
+
+    def finish_request(self):
+        return self._local.stages, self._local.queries
+
+    def _add(self, stage, elapsed):
+        stages = getattr(self._local, 'stages', None)
+        if stages is not None:
+            stages[stage] = stages.get(stage, 0) + elapsed
+
+    def wrap(self, stage, func):
+        timer = self
+
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timer._add(stage, time.perf_counter() - started)
+        return wrapper
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self._add('db', time.perf_counter() - started)
+            self._local.queries = getattr(self._local, 'queries', 0) + 1
+
+
+def percentile(values, percent):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест HTTP API в одном процессе: заглушки провайдеров, Celery в памяти. "
+        "Выводит пропускную способность, перцентили задержки, число запросов к БД и время по этапам."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+        parser.add_argument('--requests', type=int, default=200, help="Запросов на каждый эндпоинт")
+        parser.add_argument('--concurrency', type=int, default=4, help="Число параллельных клиентов (потоков)")
+        parser.add_argument('--recipients', type=int, default=10, help="Получателей в массовых запросах")
+        parser.add_argument('--eager', action='store_true',
+                            help="Без outbox выполнять задачи Celery сразу в запросе "
+                                 "вместо публикации в брокер в памяти")
+        # По умолчанию - как в настройках проекта (NOTIFICATION_USE_OUTBOX)
+        outbox_group = parser.add_mutually_exclusive_group()
+        outbox_group.add_argument('--outbox', dest='outbox', action='store_const', const=True, default=None,
+                                  help="Писать задачи в outbox")
+        outbox_group.add_argument('--no-outbox', dest='outbox', action='store_const', const=False,
+                                  help="Публиковать задачи без outbox")
+        parser.add_argument('--keep-data', action='store_true',
+                            help="Не удалять созданные логи, записи outbox и пользователя")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1:
+            raise CommandError("--requests и --concurrency должны быть положительными")
+
+        marker = f"loadtest-{uuid.uuid4().hex[:8]}"
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubProviderHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        stub_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        use_outbox = options['outbox']
+        if use_outbox is None:
+            use_outbox = getattr(settings, 'NOTIFICATION_USE_OUTBOX', False)
+
+        # Отдельный пользователь на каждый запуск, удаляется вместе с данными теста
+        user = get_user_model().objects.create_user(username=marker)
+
+        timer = StageTimer()
+        # Приложение Celery настроено с namespace='CELERY', поэтому ключи - с префиксом
+        celery_conf = {
+            'CELERY_BROKER_URL': 'memory://',
+            'CELERY_RESULT_BACKEND': 'cache+memory://',
+            'CELERY_TASK_ALWAYS_EAGER': options['eager'],
+        }
+        previous_conf = {key: celery_app.conf.get(key) for key in celery_conf}
+        celery_app.conf.update(celery_conf)
+
+        try:
+            with ExitStack() as stack:
+                stack.enter_context(override_settings(
+                    EMAIL_BACKEND='django.core.mail.backends.dummy.EmailBackend',
+                    SMSRU_API_IDS='stub',
+                    SMSRU_API_URL=f"{stub_url}/sms/send",
+                    TELEGRAM_BOT_TOKENS='1:stub',
+                    TELEGRAM_API_URL=stub_url,
+                    NOTIFICATION_USE_OUTBOX=use_outbox,
+                ))
+                stack.enter_context(mock.patch.object(
+                    APIView, 'perform_authentication',
+                    timer.wrap('auth', APIView.perform_authentication)
+                ))
+                stack.enter_context(mock.patch.object(
+                    Serializer, 'is_valid', timer.wrap('serializer', Serializer.is_valid)
+                ))
+                for name in ('send_single_message', 'send_bulk_message'):
+                    stack.enter_context(mock.patch.object(
+                        NotificationService, name, timer.wrap('service', getattr(NotificationService, name))
+                    ))
+                stack.enter_context(mock.patch.object(outbox, 'enqueue', timer.wrap('enqueue', outbox.enqueue)))
+
+                self.stdout.write(f"outbox: {'включен' if use_outbox else 'выключен'}")
+                for endpoint in options['endpoints']:
+                    report = self._run_endpoint(endpoint, user, timer, marker, options)
+                    self._print_report(endpoint, report)
+        finally:
+            celery_app.conf.update(previous_conf)
+            server.shutdown()
+            if not options['keep_data']:
+                NotificationLog.objects.filter(title=marker).delete()
+                OutboxMessage.objects.filter(kwargs__title=marker).delete()
+                user.delete()
+
+    def _payload(self, endpoint, marker, index, recipients):
+        payload = {'title': marker, 'message': f"Нагрузочный тест #{index}"}
+        if endpoint.endswith('bulk'):
+            payload['emails'] = [f"user{index}-{n}@example.com" for n in range(recipients)]
+            payload['phones'] = [f"+7916{n:07d}" for n in range(recipients)]
+            payload['telegram_chat_ids'] = [str(100000 + n) for n in range(recipients)]
+        else:
+            payload['email'] = f"user{index}@example.com"
+        return payload
+
+    def _run_endpoint(self, endpoint, user, timer, marker, options):
+        path = ENDPOINTS[endpoint]
+        local = threading.local()
+
+        def do_request(index):
+            client = getattr(local, 'client', None)
+            if client is None:
+                client = local.client = Client()
+                client.force_login(user)
+
+            timer.start_request()
+            payload = self._payload(endpoint, marker, index, options['recipients'])
+            with connection.execute_wrapper(timer.db_wrapper):
+                started = time.perf_counter()
+                response = client.post(path, data=payload, content_type='application/json')
+                elapsed = time.perf_counter() - started
+            stages, queries = timer.finish_request()
+            return elapsed, response.status_code, stages, queries
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            results = list(executor.map(do_request, range(options['requests'])))
+        wall = time.perf_counter() - started
+
+        latencies = sorted(result[0] for result in results)
+        stage_totals = {}
+        for _, _, stages, _ in results:
+            for stage, value in stages.items():
+                stage_totals[stage] = stage_totals.get(stage, 0) + value
+
+        return {
+            'wall': wall,
+            'latencies': latencies,
+            'errors': sum(1 for result in results if result[1] >= 400),
+            'queries': sum(result[3] for result in results) / len(results),
+            'stages': {stage: value / len(results) for stage, value in stage_totals.items()},
+        }
+
+    def _print_report(self, endpoint, report):
+        latencies = report['latencies']
+        count = len(latencies)
+        ms = 1000
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{endpoint} ({ENDPOINTS[endpoint]})"))
+        self.stdout.write(
+            f"  запросов: {count}, ошибок: {report['errors']}, "
+            f"пропускная способность: {count / report['wall']:.1f} req/s"
+        )
+        self.stdout.write(
+            f"  задержка, мс: p50={percentile(latencies, 50) * ms:.1f} "
+            f"p90={percentile(latencies, 90) * ms:.1f} "
+            f"p99={percentile(latencies, 99) * ms:.1f} "
+            f"max={latencies[-1] * ms:.1f}"
+        )
+        self.stdout.write(f"  запросов к БД на HTTP-запрос: {report['queries']:.1f}")
+        mean = sum(latencies) / count
+        stages = ', '.join(
+            f"{stage}={value * ms:.2f}мс ({value / mean:.0%})"
+            for stage, value in sorted(report['stages'].items(), key=lambda item: -item[1])
+        )
+        # Этапы вложены: db учитывается и внутри service/enqueue/auth
+        self.stdout.write(f"  время по этапам (среднее, этапы пересекаются с db): {stages}")
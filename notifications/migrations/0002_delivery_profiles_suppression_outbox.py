@@ -0,0 +1,103 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:40
+
+import notifications.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.CharField(max_length=36, unique=True)),
+                ('task_name', models.CharField(max_length=200)),
+                ('kwargs', models.JSONField(default=dict)),
+                ('eta', models.DateTimeField(blank=True, null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RecipientProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('email', models.EmailField(blank=True, max_length=254, null=True, unique=True)),
+                ('phone', models.CharField(blank=True, max_length=20, null=True, unique=True)),
+                ('telegram_chat_id', models.CharField(blank=True, max_length=100, null=True, unique=True)),
+                ('channel_order', models.JSONField(blank=True, default=list, help_text='Порядок каналов, например ["email", "telegram"]')),
+                ('opted_out_channels', models.JSONField(blank=True, default=list, help_text='Каналы, по которым получатель отказался от сообщений')),
+                ('timezone', models.CharField(default='Europe/Moscow', max_length=64)),
+                ('quiet_hours_start', models.TimeField(blank=True, null=True)),
+                ('quiet_hours_end', models.TimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SuppressionEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=notifications.models.channel_choices, max_length=32)),
+                ('contact', models.CharField(max_length=254)),
+                ('reason', models.CharField(choices=[('unsubscribed', 'Отписка'), ('bounced', 'Постоянный возврат'), ('blocked', 'Бот заблокирован'), ('invalid', 'Несуществующий адрес'), ('manual', 'Добавлено вручную')], default='manual', max_length=12)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='batch_id',
+            field=models.CharField(blank=True, max_length=36, null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='delivery_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Ожидает подтверждения'), ('delivered', 'Доставлено'), ('undelivered', 'Не доставлено'), ('bounced', 'Возврат')], max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='delivery_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='outcome',
+            field=models.CharField(blank=True, choices=[('sent', 'Отправлено'), ('failed', 'Ошибка провайдера'), ('unsupported', 'Канал не подключен'), ('error', 'Внутренняя ошибка'), ('opted_out', 'Отказ получателя от канала'), ('suppressed', 'Список блокировки'), ('deferred', 'Отложено')], max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='provider_account',
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='notificationlog',
+            name='provider_message_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.AlterField(
+            model_name='notificationlog',
+            name='channel_used',
+            field=models.CharField(choices=notifications.models.channel_choices, max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='notificationlog',
+            name='status',
+            field=models.CharField(choices=[('sent', 'Отправлено'), ('failed', 'Ошибка'), ('skipped', 'Пропущено')], max_length=10),
+        ),
+        migrations.AddConstraint(
+            model_name='suppressionentry',
+            constraint=models.UniqueConstraint(fields=('channel', 'contact'), name='unique_suppression_contact'),
+        ),
+    ]
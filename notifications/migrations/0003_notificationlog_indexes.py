@@ -0,0 +1,89 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndexConcurrently):
+    """CREATE INDEX CONCURRENTLY на PostgreSQL, обычный индекс на других СУБД
+
+    С postgres_only=True индекс на других СУБД остается лишь в состоянии миграций.
+    """
+
+    def __init__(self, model_name, index, postgres_only=False):
+        super().__init__(model_name, index)
+        self.postgres_only = postgres_only
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        if self.postgres_only:
+            kwargs['postgres_only'] = True
+        return name, args, kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        elif not self.postgres_only:
+            migrations.AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        elif not self.postgres_only:
+            migrations.AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class TrigramExtensionIfPostgres(TrigramExtension):
+    """TrigramExtension, которая и при откате ничего не делает на других СУБД"""
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+    # Таблица логов большая: индексы строятся без блокировки записи, вне транзакции
+    atomic = False
+
+    dependencies = [
+        ('notifications', '0002_delivery_profiles_suppression_outbox'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='notificationlog',
+            index=models.Index(fields=['email'], name='notif_log_email_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='notificationlog',
+            index=models.Index(fields=['phone'], name='notif_log_phone_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='notificationlog',
+            index=models.Index(fields=['telegram_chat_id'], name='notif_log_telegram_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='notificationlog',
+            index=models.Index(fields=['batch_id'], name='notif_log_batch_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='notificationlog',
+            index=models.Index(fields=['channel_used', 'provider_message_id'], name='notif_log_provider_msg_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='notificationlog',
+            index=models.Index(fields=['created_at'], name='notif_log_created_idx'),
+        ),
+        # Поиск по тексту в админке
+        TrigramExtensionIfPostgres(),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='notificationlog',
+            index=GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='notif_log_title_trgm'),
+            postgres_only=True,
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='notificationlog',
+            index=GinIndex(OpClass(Upper('message'), name='gin_trgm_ops'), name='notif_log_message_trgm'),
+            postgres_only=True,
+        ),
+    ]
@@ -1,24 +1,61 @@
 import re
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
+from django.utils import timezone
+
+
+def normalize_phone(phone):
+    """Номер без разделителей; российские 8XXXXXXXXXX и 7XXXXXXXXXX - в формате +7XXXXXXXXXX"""
+    cleaned_phone = re.sub(r'[^\d+]', '', phone)
+    if not cleaned_phone.startswith('+') and len(cleaned_phone) == 11:
+        if cleaned_phone.startswith('8'):
+            return '+7' + cleaned_phone[1:]
+        elif cleaned_phone.startswith('7'):
+            return '+' + cleaned_phone
+    return cleaned_phone
 
 
 class ChannelConfig:
     """Конфигурация каналов отправки"""
+
+    # Поле контакта отправщика -> список адресов
+    CONTACT_LISTS = {
+        'email': 'emails',
+        'phone': 'phones',
+        'telegram_chat_id': 'telegram_chat_ids',
+    }
+    # Стандартный канал для поля контакта
+    DEFAULT_CHANNELS = {
+        'email': 'email',
+        'phone': 'sms',
+        'telegram_chat_id': 'telegram',
+    }
+
     def __init__(self, emails=None, phones=None, telegram_chat_ids=None):
         self.emails = emails or []
         self.phones = [self._validate_phone(phone) for phone in (phones or [])]
         self.telegram_chat_ids = telegram_chat_ids or []
+
+    def get_destinations(self, contact_field):
+        """Адреса для канала, использующего указанное поле контакта"""
+        attr = self.CONTACT_LISTS.get(contact_field)
+        return getattr(self, attr) if attr else []
     
     def _validate_phone(self, phone):
         """Валидация номера телефона"""
-        cleaned_phone = re.sub(r'[^\d+]', '', phone)
-        if not cleaned_phone.startswith('+') and len(cleaned_phone) == 11:
-            if cleaned_phone.startswith('8'):
-                return '+7' + cleaned_phone[1:]
-            elif cleaned_phone.startswith('7'):
-                return '+' + cleaned_phone
-        return cleaned_phone
+        return normalize_phone(phone)
+
+
+def channel_choices():
+    """Стандартные каналы и каналы, подключенные через NOTIFICATION_SENDERS"""
+    from .services.registry import available_channels
+    labels = dict(NotificationLog.Channel.CHOICES)
+    channels = {**labels, **dict.fromkeys(available_channels())}
+    return [(channel, labels.get(channel) or channel) for channel in channels]
 
 
 class NotificationLog(models.Model):
@@ -27,7 +64,29 @@ class NotificationLog(models.Model):
     class Status:
         SENT = 'sent'
         FAILED = 'failed'
-        CHOICES = [(SENT, 'Отправлено'), (FAILED, 'Ошибка')]
+        # Не отправлено намеренно: список блокировки, отписка, отложено
+        SKIPPED = 'skipped'
+        CHOICES = [(SENT, 'Отправлено'), (FAILED, 'Ошибка'), (SKIPPED, 'Пропущено')]
+
+    class Outcome:
+        """Короткие коды результата отправки одному получателю"""
+        SENT = 'sent'
+        FAILED = 'failed'
+        UNSUPPORTED = 'unsupported'
+        ERROR = 'error'
+        OPTED_OUT = 'opted_out'
+        SUPPRESSED = 'suppressed'
+        DEFERRED = 'deferred'
+        CHOICES = [
+            (SENT, 'Отправлено'),
+            (FAILED, 'Ошибка провайдера'),
+            (UNSUPPORTED, 'Канал не подключен'),
+            (ERROR, 'Внутренняя ошибка'),
+            (OPTED_OUT, 'Отказ получателя от канала'),
+            (SUPPRESSED, 'Список блокировки'),
+            (DEFERRED, 'Отложено'),
+        ]
+        SKIPPED = (OPTED_OUT, SUPPRESSED, DEFERRED)
 
     class Channel:
         EMAIL = 'email'
@@ -35,6 +94,20 @@ class NotificationLog(models.Model):
         TELEGRAM = 'telegram'
         CHOICES = [(EMAIL, 'Email'), (SMS, 'SMS'), (TELEGRAM, 'Telegram')]
 
+    class DeliveryStatus:
+        PENDING = 'pending'
+        DELIVERED = 'delivered'
+        UNDELIVERED = 'undelivered'
+        BOUNCED = 'bounced'
+        CHOICES = [
+            (PENDING, 'Ожидает подтверждения'),
+            (DELIVERED, 'Доставлено'),
+            (UNDELIVERED, 'Не доставлено'),
+            (BOUNCED, 'Возврат'),
+        ]
+        # Окончательные статусы: поздние и повторные отчеты их не меняют
+        FINAL = (DELIVERED, UNDELIVERED, BOUNCED)
+
     # Контактные данныеы
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
@@ -45,20 +118,59 @@ class NotificationLog(models.Model):
     message = models.TextField()
 
     # Статус отправки
-    channel_used = models.CharField(max_length=10, choices=Channel.CHOICES)
+    channel_used = models.CharField(max_length=32, choices=channel_choices)
     status = models.CharField(max_length=10, choices=Status.CHOICES)
+    outcome = models.CharField(max_length=12, choices=Outcome.CHOICES, blank=True, null=True)
     error_message = models.TextField(blank=True, null=True)
 
+    # Статус доставки по данным провайдера
+    provider_message_id = models.CharField(max_length=255, blank=True, null=True)
+    provider_account = models.CharField(max_length=50, blank=True, null=True)
+    delivery_status = models.CharField(
+        max_length=12, choices=DeliveryStatus.CHOICES, blank=True, null=True
+    )
+    delivery_updated_at = models.DateTimeField(blank=True, null=True)
+
+    # Идентификатор рассылки (id задачи Celery) для выборки результатов по получателям
+    batch_id = models.CharField(max_length=36, blank=True, null=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-created_at']
+        # Индексы создаются миграцией 0003 через CREATE INDEX CONCURRENTLY
+        indexes = [
+            models.Index(fields=['email'], name='notif_log_email_idx'),
+            models.Index(fields=['phone'], name='notif_log_phone_idx'),
+            models.Index(fields=['telegram_chat_id'], name='notif_log_telegram_idx'),
+            models.Index(fields=['batch_id'], name='notif_log_batch_idx'),
+            models.Index(fields=['channel_used', 'provider_message_id'], name='notif_log_provider_msg_idx'),
+            models.Index(fields=['created_at'], name='notif_log_created_idx'),
+            # Поиск по тексту в админке (icontains -> UPPER(...) LIKE); создаются только на PostgreSQL
+            GinIndex(OpClass(Upper('title'), name='gin_trgm_ops'), name='notif_log_title_trgm'),
+            GinIndex(OpClass(Upper('message'), name='gin_trgm_ops'), name='notif_log_message_trgm'),
+        ]
 
     @classmethod
     def create_log(cls, channel_used, status, title, message, 
-                   email=None, phone=None, telegram_chat_id=None, error_message=None):
+                   email=None, phone=None, telegram_chat_id=None, error_message=None,
+                   provider_message_id=None, provider_account=None, batch_id=None, outcome=None):
         """Создать запись в логе"""
-        return cls.objects.create(
+        log = cls.build_log(
+            channel_used, status, title, message,
+            email=email, phone=phone, telegram_chat_id=telegram_chat_id, error_message=error_message,
+            provider_message_id=provider_message_id, provider_account=provider_account,
+            batch_id=batch_id, outcome=outcome
+        )
+        log.save()
+        return log
+
+    @classmethod
+    def build_log(cls, channel_used, status, title, message,
+                  email=None, phone=None, telegram_chat_id=None, error_message=None,
+                  provider_message_id=None, provider_account=None, batch_id=None, outcome=None):
+        """Запись лога без сохранения (для bulk_create)"""
+        return cls(
             email=email,
             phone=phone,
             telegram_chat_id=telegram_chat_id,
@@ -66,5 +178,185 @@ class NotificationLog(models.Model):
             message=message,
             channel_used=channel_used,
             status=status,
-            error_message=error_message
-        )
\ No newline at end of file
+            # Для отправленных и ошибок провайдера код совпадает со статусом
+            outcome=outcome or status,
+            error_message=error_message,
+            provider_message_id=provider_message_id,
+            provider_account=provider_account,
+            batch_id=batch_id,
+            delivery_status=cls.DeliveryStatus.PENDING if provider_message_id else None
+        )
+
+    @classmethod
+    def apply_delivery_statuses(cls, channel, events):
+        """Применить пакет статусов доставки
+
+        events - список кортежей (provider_message_id, delivery_status, error).
+        Записи группируются по статусу и тексту ошибки, на каждую группу
+        выполняется один UPDATE. Записи с окончательным статусом не
+        обновляются. Возвращает число обновленных записей.
+        """
+        groups = {}
+        for message_id, delivery_status, error in events:
+            groups.setdefault((delivery_status, error), []).append(message_id)
+
+        now = timezone.now()
+        updated = 0
+        for (delivery_status, error), message_ids in groups.items():
+            fields = {'delivery_status': delivery_status, 'delivery_updated_at': now}
+            if error:
+                fields['error_message'] = error
+            updated += cls.objects.filter(
+                channel_used=channel,
+                provider_message_id__in=message_ids
+            ).exclude(
+                delivery_status__in=cls.DeliveryStatus.FINAL
+            ).update(**fields)
+        return updated
+
+
+class RecipientProfile(models.Model):
+    """Настройки доставки получателя: порядок каналов, отписки и тихие часы"""
+
+    # Контакты, по которым профиль сопоставляется с получателем
+    email = models.EmailField(blank=True, null=True, unique=True)
+    phone = models.CharField(max_length=20, blank=True, null=True, unique=True)
+    telegram_chat_id = models.CharField(max_length=100, blank=True, null=True, unique=True)
+
+    channel_order = models.JSONField(
+        default=list, blank=True,
+        help_text="Порядок каналов, например [\"email\", \"telegram\"]"
+    )
+    opted_out_channels = models.JSONField(
+        default=list, blank=True,
+        help_text="Каналы, по которым получатель отказался от сообщений"
+    )
+
+    # Тихие часы в часовом поясе получателя; интервал может переходить через полночь
+    timezone = models.CharField(max_length=64, default='Europe/Moscow')
+    quiet_hours_start = models.TimeField(blank=True, null=True)
+    quiet_hours_end = models.TimeField(blank=True, null=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.email or self.phone or self.telegram_chat_id or f"Профиль {self.pk}"
+
+    def save(self, *args, **kwargs):
+        # Получатели сопоставляются по нормализованному номеру (+7...)
+        if self.phone:
+            self.phone = normalize_phone(self.phone) or None
+        super().save(*args, **kwargs)
+
+    def is_opted_out(self, channel):
+        return channel in (self.opted_out_channels or [])
+
+    def get_channel_order(self, default_order):
+        """Порядок каналов профиля, дополненный каналами по умолчанию, без отписок"""
+        order = [channel for channel in (self.channel_order or []) if channel in default_order]
+        order += [channel for channel in default_order if channel not in order]
+        return [channel for channel in order if not self.is_opted_out(channel)]
+
+    def get_tzinfo(self):
+        try:
+            return ZoneInfo(self.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            return timezone.get_default_timezone()
+
+    def quiet_until(self, now=None):
+        """Момент окончания тихих часов или None, если сейчас отправлять можно"""
+        if self.quiet_hours_start is None or self.quiet_hours_end is None:
+            return None
+        if self.quiet_hours_start == self.quiet_hours_end:
+            return None
+
+        local_now = (now or timezone.now()).astimezone(self.get_tzinfo())
+        current = local_now.time()
+        start, end = self.quiet_hours_start, self.quiet_hours_end
+        if start < end:
+            quiet = start <= current < end
+        else:
+            quiet = current >= start or current < end
+        if not quiet:
+            return None
+
+        resume = datetime.combine(local_now.date(), end, tzinfo=local_now.tzinfo)
+        if resume <= local_now:
+            resume += timedelta(days=1)
+        return resume
+
+
+class SuppressionEntry(models.Model):
+    """Контакт, на который сообщения по каналу не отправляются"""
+
+    class Reason:
+        UNSUBSCRIBED = 'unsubscribed'
+        BOUNCED = 'bounced'
+        BLOCKED = 'blocked'
+        INVALID = 'invalid'
+        MANUAL = 'manual'
+        CHOICES = [
+            (UNSUBSCRIBED, 'Отписка'),
+            (BOUNCED, 'Постоянный возврат'),
+            (BLOCKED, 'Бот заблокирован'),
+            (INVALID, 'Несуществующий адрес'),
+            (MANUAL, 'Добавлено вручную'),
+        ]
+
+    channel = models.CharField(max_length=32, choices=channel_choices)
+    contact = models.CharField(max_length=254)
+    reason = models.CharField(max_length=12, choices=Reason.CHOICES, default=Reason.MANUAL)
+    error_message = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['channel', 'contact'], name='unique_suppression_contact'),
+        ]
+
+    def __str__(self):
+        return f"{self.channel}: {self.contact}"
+
+    def save(self, *args, **kwargs):
+        # Записи из админки и API сравниваются с контактами так же, как при отправке
+        self.contact = self.normalize_contact(self.channel, self.contact)
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def normalize_contact(channel, contact):
+        """Контакт в том виде, в котором он сравнивается при отправке
+
+        Email - без учета регистра, телефон - в формате ChannelConfig (+7...).
+        """
+        from .services.registry import get_sender
+        sender = get_sender(channel)
+        contact_field = sender.contact_field if sender else None
+        contact = str(contact).strip()
+        if contact_field == 'email' or channel == NotificationLog.Channel.EMAIL:
+            return contact.lower()
+        if contact_field == 'phone' or channel == NotificationLog.Channel.SMS:
+            return normalize_phone(contact)
+        return contact
+
+
+class OutboxMessage(models.Model):
+    """Задача Celery, записанная в транзакции запроса и ожидающая публикации в брокер"""
+
+    task_id = models.CharField(max_length=36, unique=True)
+    task_name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict)
+    # Время запуска задачи (отложенные отправки); None - сразу
+    eta = models.DateTimeField(blank=True, null=True)
+
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"{self.task_name} ({self.task_id})"
@@ -0,0 +1,45 @@
+import json
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор с оценкой числа строк по плану запроса PostgreSQL
+
+    Точный COUNT выполняется только для небольших выборок (оценка ниже
+    NOTIFICATION_ADMIN_EXACT_COUNT_LIMIT) и для других СУБД.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return super().count
+
+        estimate = self._estimate(queryset.order_by(), connection)
+        if estimate is None or estimate < getattr(settings, 'NOTIFICATION_ADMIN_EXACT_COUNT_LIMIT', 100000):
+            return super().count
+        return estimate
+
+    def _estimate(self, queryset, connection):
+        query = queryset.query
+        if not query.where:
+            # Без фильтров достаточно статистики таблицы
+            sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass"
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+            # -1 - таблица еще не анализировалась
+            return row[0] if row and row[0] >= 0 else None
+
+        sql, params = query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
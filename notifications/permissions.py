@@ -0,0 +1,12 @@
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from rest_framework.permissions import BasePermission
+
+
+class WebhookTokenPermission(BasePermission):
+    """Доступ к вебхукам провайдеров по общему секрету в параметре token"""
+
+    def has_permission(self, request, view):
+        expected = getattr(settings, 'NOTIFICATION_WEBHOOK_TOKEN', '')
+        token = request.query_params.get('token', '')
+        return bool(expected) and constant_time_compare(token, expected)
@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class _NullStage:
+    """Этап без профилирования: ничего не делает"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    def __init__(self, session, name):
+        self.session = session
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.session.add_stage(self.name, time.perf_counter() - self.started)
+        return False
+
+
+def stage(name):
+    """Замер этапа внутри активной сессии профилирования
+
+    Без активной сессии возвращает общий пустой контекст, поэтому вызов
+    в горячем цикле стоит одного обращения к thread-local.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        return _NULL_STAGE
+    return _Stage(session, name)
+
+
+def is_active():
+    return getattr(_local, 'session', None) is not None
+
+
+class ProfileSession:
+    """Сэмплирующий профайлер одного потока и сводка по этапам
+
+    Фоновый поток раз в interval секунд снимает стек профилируемого потока
+    через sys._current_frames() и считает одинаковые стеки. Результат
+    записывается в формате collapsed stacks (flamegraph.pl, speedscope)
+    и в JSON со временем по этапам.
+    """
+
+    def __init__(self, name, interval=0.005, output_dir=None):
+        self.name = name
+        self.interval = interval
+        self.output_dir = output_dir or os.path.join(tempfile.gettempdir(), 'notification_profiles')
+        self.thread_id = threading.get_ident()
+        self.stacks = {}
+        self.stages = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+
+    def add_stage(self, name, elapsed):
+        total, count = self.stages.get(name, (0.0, 0))
+        self.stages[name] = (total + elapsed, count + 1)
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}")
+                frame = frame.f_back
+            key = ';'.join(reversed(names))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        self.wall = time.perf_counter() - self.started
+
+    def write(self):
+        """Записать результаты; возвращает пути к файлам
+
+        К имени добавляется случайный суффикс, чтобы сессии с одинаковым
+        именем не перезаписывали файлы друг друга.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"{self.name.replace(os.sep, '_')}-{uuid.uuid4().hex[:8]}")
+
+        collapsed_path = f"{base}.collapsed"
+        with open(collapsed_path, 'w') as output:
+            for key, count in sorted(self.stacks.items()):
+                output.write(f"{key} {count}\n")
+
+        stages_path = f"{base}.stages.json"
+        with open(stages_path, 'w') as output:
+            json.dump({
+                'name': self.name,
+                'wall_seconds': round(self.wall, 6),
+                'samples': self.samples,
+                'interval_seconds': self.interval,
+                'stages': {
+                    name: {
+                        'total_seconds': round(total, 6),
+                        'count': count,
+                        'share': round(total / self.wall, 4) if self.wall else 0,
+                    }
+                    for name, (total, count) in sorted(self.stages.items(), key=lambda item: -item[1][0])
+                },
+            }, output, ensure_ascii=False, indent=2)
+
+        return {'collapsed': collapsed_path, 'stages': stages_path}
+
+
+def profiling_enabled():
+    return getattr(settings, 'NOTIFICATION_PROFILING', False)
+
+
+@contextmanager
+def profile_session(name):
+    """Профилировать блок; вложенные сессии не создаются
+
+    Возвращает словарь, в который после выхода из блока попадают пути
+    к файлам результатов (пустой для вложенного вызова).
+    """
+    paths = {}
+    if is_active():
+        yield paths
+        return
+
+    session = ProfileSession(
+        name,
+        interval=getattr(settings, 'NOTIFICATION_PROFILING_INTERVAL', 0.005),
+        output_dir=getattr(settings, 'NOTIFICATION_PROFILING_DIR', None)
+    )
+    _local.session = session
+    session.start()
+    try:
+        yield paths
+    finally:
+        session.stop()
+        _local.session = None
+        try:
+            paths.update(session.write())
+            logger.info(f"Profile for {name} written to {paths['collapsed']}")
+        except OSError as e:
+            logger.error(f"Failed to write profile for {name}: {str(e)}")
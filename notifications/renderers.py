@@ -0,0 +1,22 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Рендерер для server-sent events
+
+    Поток событий формирует представление. Остальные ответы (ошибки
+    аутентификации, 404) отдаются одним событием error, чтобы EventSource
+    получил корректный поток.
+    """
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, (str, bytes)):
+            return data
+        return f"event: error\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode()
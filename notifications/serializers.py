@@ -1,6 +1,70 @@
+from collections.abc import Mapping
+
 from rest_framework import serializers
+from rest_framework.utils import html
+
+from .models import NotificationLog, SuppressionEntry, channel_choices
+from .validators import (
+    clean_email,
+    clean_user,
+    error_report,
+    make_string_cleaner,
+    validate_list
+)
+
+
+class FastListField(serializers.ListField):
+    """Список, проверяемый одним проходом функции clean вместо поля child
+
+    clean возвращает очищенное значение или None для некорректного элемента.
+    Ошибка содержит только индексы некорректных элементов. DRF приводит детали
+    ValidationError к строкам, поэтому отчет с числами сохраняется в invalid_report
+    и подставляется в errors сериализатором FastListSerializer.
+    """
+
+    def __init__(self, clean, **kwargs):
+        self.clean = clean
+        self.invalid_report = None
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        self.invalid_report = None
+        if html.is_html_input(data):
+            data = html.parse_html_list(data, default=[])
+        if isinstance(data, (str, Mapping)) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        values, invalid = validate_list(data, self.clean)
+        if invalid:
+            self.invalid_report = error_report(invalid, len(data))
+            raise serializers.ValidationError(self.invalid_report)
+        return values
+
+
+class FastListSerializer(serializers.Serializer):
+    """Сериализатор с полями FastListField: в errors отчеты о списках с числовыми значениями"""
 
-from .models import NotificationLog
+    @property
+    def errors(self):
+        errors = super().errors
+        for name, field in self.fields.items():
+            report = getattr(field, 'invalid_report', None)
+            if report is not None and name in errors:
+                errors[name] = report
+        return errors
+
+
+class ChannelChoiceField(serializers.ChoiceField):
+    """Канал из подключенных отправщиков
+
+    Список каналов читается при создании сериализатора, поэтому
+    учитывает NOTIFICATION_SENDERS.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(choices=channel_choices(), **kwargs)
 
 
 class SendSingleMessageSerializer(serializers.Serializer):
@@ -11,10 +75,7 @@ class SendSingleMessageSerializer(serializers.Serializer):
     email = serializers.EmailField(required=False)
     phone = serializers.CharField(max_length=20, required=False)
     telegram_chat_id = serializers.CharField(max_length=100, required=False)
-    preferred_channel = serializers.ChoiceField(
-        choices=NotificationLog.Channel.CHOICES,
-        required=False
-    )
+    preferred_channel = ChannelChoiceField(required=False)
 
     def validate(self, attrs):
         if not any([attrs.get('email'), attrs.get('phone'), attrs.get('telegram_chat_id')]):
@@ -24,30 +85,27 @@ class SendSingleMessageSerializer(serializers.Serializer):
         return attrs
 
 
-class SendBulkMessageSerializer(serializers.Serializer):
+class SendBulkMessageSerializer(FastListSerializer):
     """Сериализатор для отправки сообщения нескольким пользователям"""
 
     title = serializers.CharField(max_length=200)
     message = serializers.CharField()
-    emails = serializers.ListField(
-        child=serializers.EmailField(),
+    emails = FastListField(
+        clean_email,
         required=False,
         default=[]
     )
-    phones = serializers.ListField(
-        child=serializers.CharField(max_length=20),
+    phones = FastListField(
+        make_string_cleaner(20),
         required=False,
         default=[]
     )
-    telegram_chat_ids = serializers.ListField(
-        child=serializers.CharField(max_length=100),
+    telegram_chat_ids = FastListField(
+        make_string_cleaner(100),
         required=False,
         default=[]
     )
-    preferred_channel = serializers.ChoiceField(
-        choices=NotificationLog.Channel.CHOICES,
-        required=False
-    )
+    preferred_channel = ChannelChoiceField(required=False)
 
     def validate(self, attrs):
         if not any([attrs.get('emails'), attrs.get('phones'), attrs.get('telegram_chat_ids')]):
@@ -57,27 +115,17 @@ class SendBulkMessageSerializer(serializers.Serializer):
         return attrs
 
 
-class SendUserListMessageSerializer(serializers.Serializer):
+class SendUserListMessageSerializer(FastListSerializer):
     """Сериализатор для отправки сообщения списку пользователей"""
 
     title = serializers.CharField(max_length=200)
     message = serializers.CharField()
-    users = serializers.ListField(
-        child=serializers.DictField(child=serializers.CharField()),
-        help_text="Список пользователей: [{'email': '...', 'phone': '...', 'telegram_chat_id': '...'}]"
-    )
-    preferred_channel = serializers.ChoiceField(
-        choices=NotificationLog.Channel.CHOICES,
-        required=False
+    users = FastListField(
+        clean_user,
+        help_text="Список пользователей: [{'email': '...', 'phone': '...', 'telegram_chat_id': '...'}]. "
+                  "Каждый пользователь должен иметь хотя бы один корректный контакт"
     )
-
-    def validate_users(self, value):
-        for user in value:
-            if not any([user.get('email'), user.get('phone'), user.get('telegram_chat_id')]):
-                raise serializers.ValidationError(
-                    "Каждый пользователь должен иметь хотя бы один контакт"
-                )
-        return value
+    preferred_channel = ChannelChoiceField(required=False)
 
 
 class NotificationLogSerializer(serializers.ModelSerializer):
@@ -89,8 +137,9 @@ class NotificationLogSerializer(serializers.ModelSerializer):
         model = NotificationLog
         fields = [
             'id', 'email', 'phone', 'telegram_chat_id', 'title', 'message',
-            'channel_used', 'channel_display', 'status', 'status_display',
-            'error_message', 'created_at'
+            'channel_used', 'channel_display', 'status', 'status_display', 'outcome',
+            'error_message', 'provider_message_id', 'provider_account', 'delivery_status',
+            'delivery_updated_at', 'batch_id', 'created_at'
         ]
         read_only_fields = fields
 
@@ -101,4 +150,66 @@ class BulkSendResultSerializer(serializers.Serializer):
     total_recipients = serializers.IntegerField()
     successful = serializers.IntegerField()
     failed = serializers.IntegerField()
-    details = serializers.ListField(child=serializers.DictField())
\ No newline at end of file
+    details = serializers.ListField(child=serializers.DictField())
+    skipped = serializers.IntegerField(
+        required=False,
+        help_text="Получатели, отказавшиеся от канала"
+    )
+    deferred_task_ids = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        help_text="Задачи для получателей, у которых сейчас тихие часы"
+    )
+    sms = serializers.DictField(
+        required=False,
+        help_text="Прогноз по SMS: кодировка, число сегментов и стоимость"
+    )
+
+
+class TaskStatusBatchSerializer(serializers.Serializer):
+    """Сериализатор запроса статусов нескольких задач"""
+
+    task_ids = serializers.ListField(
+        child=serializers.CharField(max_length=36),
+        allow_empty=False,
+        max_length=100
+    )
+    wait = serializers.IntegerField(required=False, min_value=0, default=0)
+
+
+class DeliveryStatusEventSerializer(serializers.Serializer):
+    """Сериализатор одного события доставки от провайдера"""
+
+    message_id = serializers.CharField(max_length=100)
+    status = serializers.ChoiceField(choices=[
+        NotificationLog.DeliveryStatus.DELIVERED,
+        NotificationLog.DeliveryStatus.UNDELIVERED,
+        NotificationLog.DeliveryStatus.BOUNCED,
+    ])
+    error = serializers.CharField(required=False, allow_blank=True)
+
+
+class DeliveryStatusBatchSerializer(serializers.Serializer):
+    """Сериализатор пакета событий доставки (отчеты о доставке, bounce)"""
+
+    channel = ChannelChoiceField()
+    events = serializers.ListField(child=DeliveryStatusEventSerializer(), allow_empty=False)
+
+
+class SuppressionEntrySerializer(serializers.ModelSerializer):
+    """Сериализатор записи списка блокировки"""
+    reason_display = serializers.CharField(source='get_reason_display', read_only=True)
+
+    class Meta:
+        model = SuppressionEntry
+        fields = ['id', 'channel', 'contact', 'reason', 'reason_display', 'error_message', 'created_at']
+        read_only_fields = ['id', 'created_at']
+
+    def to_internal_value(self, data):
+        # Нормализация до валидаторов: проверка уникальности (channel, contact) сравнивает уже
+        # нормализованный контакт, иначе дубль в другом формате падает на IntegrityError
+        attrs = super().to_internal_value(data)
+        channel = attrs.get('channel', getattr(self.instance, 'channel', None))
+        if 'contact' in attrs and channel:
+            attrs['contact'] = SuppressionEntry.normalize_contact(channel, attrs['contact'])
+        return attrs
@@ -1,6 +1,17 @@
-from .email_sender import EmailSender
-from .sms_sender import SMSSender
-from .telegram_sender import TelegramSender
-from .notification_service import NotificationService
+from importlib import import_module
 
-__all__ = ['EmailSender', 'SMSSender', 'TelegramSender', 'NotificationService']
\ No newline at end of file
+# Бэкенды каналов (и requests) импортируются только при первом обращении
+_LAZY_EXPORTS = {
+    'EmailSender': '.email_sender',
+    'SMSSender': '.sms_sender',
+    'TelegramSender': '.telegram_sender',
+    'NotificationService': '.notification_service',
+}
+
+__all__ = ['EmailSender', 'SMSSender', 'TelegramSender', 'NotificationService']
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,110 @@
+import hashlib
+import math
+import threading
+import time
+from typing import NamedTuple, Tuple
+
+
+class Account(NamedTuple):
+    """Учетная запись провайдера: метка для логов и секрет (токен, api_id)"""
+    label: str
+    secret: str
+    weight: float = 1.0
+
+
+class AccountHealth:
+    """Состояние учетных записей в процессе: ошибки подряд и пауза после лимитов
+
+    Хранится отдельно от снимка настроек, чтобы переживать его перезагрузку.
+    """
+
+    FAILURE_THRESHOLD = 3
+    BASE_COOLDOWN = 5
+    MAX_COOLDOWN = 300
+
+    def __init__(self):
+        self._failures = {}
+        self._cooldown_until = {}
+        self._lock = threading.Lock()
+
+    def weight(self, label):
+        """Множитель веса: 0 на паузе, убывает с числом ошибок подряд"""
+        if self._cooldown_until.get(label, 0) > time.monotonic():
+            return 0.0
+        return 1.0 / (1 + self._failures.get(label, 0))
+
+    def cooldown_remaining(self, label):
+        """Сколько секунд учетная запись еще на паузе (0, если не на паузе)"""
+        return max(0.0, self._cooldown_until.get(label, 0) - time.monotonic())
+
+    def record_success(self, label):
+        if self._failures.get(label):
+            with self._lock:
+                self._failures.pop(label, None)
+                self._cooldown_until.pop(label, None)
+
+    def record_failure(self, label, retry_after=None):
+        """Ошибка учетной записи; retry_after - пауза, запрошенная провайдером"""
+        with self._lock:
+            failures = self._failures.get(label, 0) + 1
+            self._failures[label] = failures
+            if retry_after:
+                cooldown = float(retry_after)
+            elif failures >= self.FAILURE_THRESHOLD:
+                cooldown = min(self.BASE_COOLDOWN * 2 ** (failures - self.FAILURE_THRESHOLD), self.MAX_COOLDOWN)
+            else:
+                return
+            self._cooldown_until[label] = time.monotonic() + cooldown
+
+
+health = AccountHealth()
+
+
+def _hash_unit(key, label):
+    """Псевдослучайное число из (0, 1) для пары получатель/учетная запись"""
+    digest = hashlib.blake2b(f"{label}:{key}".encode(), digest_size=8).digest()
+    return (int.from_bytes(digest, 'big') + 1) / (2 ** 64 + 2)
+
+
+class AccountPool:
+    """Пул учетных записей с выбором по взвешенному rendezvous-хешированию
+
+    Получатель стабильно закрепляется за одной учетной записью; при изменении
+    веса или исключении записи перераспределяются только ее получатели.
+    В закрепленном пуле (sticky) здоровье не учитывается: получатель всегда
+    получает одну и ту же запись, даже если она на паузе.
+    """
+
+    def __init__(self, accounts: Tuple[Account, ...], sticky: bool = False):
+        self.accounts = tuple(accounts)
+        self.sticky = sticky
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def __bool__(self):
+        return bool(self.accounts)
+
+    def choose(self, key):
+        """Учетная запись для получателя с учетом здоровья"""
+        return self.ranked(key)[0]
+
+    def ranked(self, key):
+        """Учетные записи в порядке предпочтения для получателя; первая - та, что вернет choose"""
+        if len(self.accounts) == 1:
+            return list(self.accounts)
+
+        if self.sticky:
+            weights = [account.weight for account in self.accounts]
+        else:
+            weights = [account.weight * health.weight(account.label) for account in self.accounts]
+        if not any(weights):
+            # Все записи на паузе - распределяем без учета здоровья
+            weights = [account.weight for account in self.accounts]
+
+        scored = [
+            (-weight / math.log(_hash_unit(key, account.label)), account)
+            for account, weight in zip(self.accounts, weights)
+            if weight > 0
+        ]
+        return [account for _, account in sorted(scored, key=lambda item: -item[0])]
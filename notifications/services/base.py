@@ -5,16 +5,42 @@ from abc import ABC, abstractmethod
 logger = logging.getLogger(__name__)
 
 
+class SendDeferred(Exception):
+    """Отправку нельзя выполнить сейчас; повторить через retry_after секунд"""
+
+    def __init__(self, retry_after, reason=''):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
 class BaseSender(ABC):
     """Абстрактный базовый класс для отправщиков"""
 
+    # Поле контакта получателя: 'email', 'phone' или 'telegram_chat_id'
+    contact_field = None
+
+    # Фрагменты текста ошибки, означающие, что адрес недоступен навсегда,
+    # и причина, с которой такой адрес попадает в список блокировки
+    permanent_errors = ()
+    suppression_reason = None
+
     @abstractmethod
     def send(self, destination, title, message):
-        """Отправить сообщение"""
+        """Отправить сообщение
+
+        Возвращает (True, id сообщения у провайдера или None)
+        либо (False, текст ошибки). Третьим элементом можно вернуть
+        метку учетной записи провайдера, через которую шла отправка.
+        Если отправить можно только позже, выбрасывает SendDeferred.
+        """
         pass
 
     def validate_destination(self, destination):
         """Валидация адреса назначения"""
         if not destination:
             raise ValueError("Пункт назначения не может быть пустым")
-        return True
\ No newline at end of file
+        return True
+
+    def is_permanent_failure(self, error):
+        """Ошибка означает, что повторная отправка на этот адрес бессмысленна"""
+        return bool(error) and any(marker in error for marker in self.permanent_errors)
\ No newline at end of file
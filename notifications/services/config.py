@@ -0,0 +1,153 @@
+import logging
+import os
+import signal
+import hashlib
+import threading
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from dotenv import dotenv_values
+from django.core.signals import setting_changed
+
+from .accounts import Account, AccountPool
+
+
+logger = logging.getLogger(__name__)
+
+
+class SenderConfig(NamedTuple):
+    """Снимок настроек отправщиков, вычисляется один раз на процесс"""
+    smsru_accounts: AccountPool
+    smsru_api_url: str
+    smsru_timeout: float
+    sms_max_segments: Optional[int]
+    sms_fit_mode: Optional[str]
+    sms_segment_price: Optional[float]
+    telegram_accounts: AccountPool
+    telegram_timeout: float
+    telegram_max_wait: float
+
+
+def _as_tuple(value):
+    """Список значений из настройки: строка через запятую или последовательность"""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = value.split(',')
+    return tuple(item.strip() for item in value if item and item.strip())
+
+
+# Настройки, которые перечитываются из env-файла по сигналу перезагрузки
+RELOADABLE_SETTINGS = (
+    'SMSRU_API_ID', 'SMSRU_API_IDS', 'SMSRU_API_URL', 'SMSRU_TIMEOUT',
+    'SMS_MAX_SEGMENTS', 'SMS_FIT_MODE', 'SMS_SEGMENT_PRICE',
+    'TELEGRAM_BOT_TOKEN', 'TELEGRAM_BOT_TOKENS', 'TELEGRAM_API_URL', 'TELEGRAM_TIMEOUT',
+    'TELEGRAM_MAX_WAIT',
+)
+
+
+def read_env_file(path=None):
+    """Значения RELOADABLE_SETTINGS из env-файла (NOTIFICATION_CONFIG_ENV_FILE)
+
+    django.conf.settings вычисляется из окружения один раз при импорте,
+    поэтому новые учетные данные без перезапуска можно взять только из файла.
+    """
+    path = path or getattr(settings, 'NOTIFICATION_CONFIG_ENV_FILE', None)
+    if not path or not os.path.exists(path):
+        logger.warning(f"Sender config env file {path} not found, using settings")
+        return {}
+    values = dotenv_values(path)
+    return {name: values[name] for name in RELOADABLE_SETTINGS if values.get(name) is not None}
+
+
+def build_config(overrides=None):
+    """Собрать снимок из django.conf.settings; overrides - значения из env-файла"""
+    overrides = overrides or {}
+
+    def setting(name, default=None):
+        return overrides[name] if name in overrides else getattr(settings, name, default)
+
+    smsru_api_ids = _as_tuple(setting('SMSRU_API_IDS')) or _as_tuple(setting('SMSRU_API_ID'))
+    telegram_bot_tokens = _as_tuple(setting('TELEGRAM_BOT_TOKENS')) or _as_tuple(setting('TELEGRAM_BOT_TOKEN'))
+    price = setting('SMS_SEGMENT_PRICE')
+    max_segments = setting('SMS_MAX_SEGMENTS')
+    telegram_api_url = setting('TELEGRAM_API_URL', 'https://api.telegram.org').rstrip('/')
+
+    return SenderConfig(
+        # Секреты не пишутся в лог: SMS.ru - по хешу api_id, Telegram - по id бота
+        smsru_accounts=AccountPool(tuple(
+            Account(f"smsru-{hashlib.sha1(api_id.encode()).hexdigest()[:8]}", api_id)
+            for api_id in smsru_api_ids
+        )),
+        smsru_api_url=setting('SMSRU_API_URL', 'https://sms.ru/sms/send'),
+        smsru_timeout=float(setting('SMSRU_TIMEOUT', 10)),
+        sms_max_segments=(int(max_segments) or None) if max_segments not in (None, '') else None,
+        sms_fit_mode=setting('SMS_FIT_MODE') or None,
+        sms_segment_price=float(price) if price not in (None, '') else None,
+        # Для Telegram секретом служит готовый URL метода sendMessage. Чат всегда
+        # получает сообщения от одного бота: другой бот в нем может быть не запущен
+        telegram_accounts=AccountPool(tuple(
+            Account(f"bot{token.split(':')[0]}", f"{telegram_api_url}/bot{token}/sendMessage")
+            for token in telegram_bot_tokens
+        ), sticky=True),
+        telegram_timeout=float(setting('TELEGRAM_TIMEOUT', 10)),
+        telegram_max_wait=float(setting('TELEGRAM_MAX_WAIT', 30)),
+    )
+
+
+_config = None
+_lock = threading.Lock()
+
+
+def get_config():
+    """Текущий снимок настроек
+
+    Отправка берет ссылку на снимок один раз, поэтому перезагрузка
+    не влияет на уже начатые отправки.
+    """
+    config = _config
+    if config is None:
+        with _lock:
+            config = _config
+            if config is None:
+                config = reload_config()
+    return config
+
+
+def reload_config(from_env_file=False):
+    """Перечитать настройки и атомарно заменить снимок
+
+    С from_env_file значения из env-файла имеют приоритет над settings.
+    """
+    global _config
+    config = build_config(read_env_file() if from_env_file else None)
+    _config = config
+    logger.info(
+        f"Sender config loaded: {len(config.smsru_accounts)} SMS.ru accounts, "
+        f"{len(config.telegram_accounts)} Telegram bots"
+    )
+    return config
+
+
+def _handle_reload_signal(signum, frame):
+    reload_config(from_env_file=True)
+
+
+def _handle_setting_changed(**kwargs):
+    reload_config()
+
+
+def install_reload_hooks():
+    """Перезагрузка снимка по сигналу NOTIFICATION_CONFIG_RELOAD_SIGNAL и при override_settings"""
+    setting_changed.connect(_handle_setting_changed, dispatch_uid='notifications_sender_config')
+
+    signal_name = getattr(settings, 'NOTIFICATION_CONFIG_RELOAD_SIGNAL', 'SIGUSR2')
+    signum = getattr(signal, signal_name or '', None)
+    if signum is None:
+        return False
+    try:
+        signal.signal(signum, _handle_reload_signal)
+    except ValueError:
+        # Обработчик можно установить только из главного потока
+        return False
+    return True
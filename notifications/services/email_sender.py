@@ -1,6 +1,8 @@
 import logging
+from email.utils import make_msgid
+from smtplib import SMTPRecipientsRefused
 
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.conf import settings
 from .base import BaseSender
 
@@ -10,18 +12,35 @@ logger = logging.getLogger(__name__)
 
 class EmailSender(BaseSender):
     """Отправка сообщений по почте"""
+    contact_field = 'email'
+    permanent_errors = ('Адрес отклонен сервером',)
+    suppression_reason = 'bounced'
+
     def send(self, destination, title, message):
         try:
             self.validate_destination(destination)
 
-            send_mail(
+            # Message-ID нужен для сопоставления уведомлений о возврате (bounce);
+            # без EMAIL_MESSAGE_ID_DOMAIN домен берется из FQDN хоста (в подах он длинный)
+            message_id = make_msgid(domain=getattr(settings, 'EMAIL_MESSAGE_ID_DOMAIN', None))
+            EmailMessage(
                 subject=title,
-                message=message,
+                body=message,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[destination],
-                fail_silently=False,
-            )
-            return True, None
+                to=[destination],
+                headers={'Message-ID': message_id},
+            ).send(fail_silently=False)
+            return True, message_id
+
+        except SMTPRecipientsRefused as e:
+            code, reason = next(iter(e.recipients.values()), (None, b''))
+            if isinstance(reason, bytes):
+                reason = reason.decode(errors='replace')
+            logger.error(f"Сервер отклонил адрес {destination}: {code} {reason}")
+            # Коды 5xx - постоянная ошибка, 4xx - временная
+            if code and 500 <= code < 600:
+                return False, f"Адрес отклонен сервером: {code} {reason}"
+            return False, f"Адрес временно недоступен: {code} {reason}"
 
         except Exception as e:
             logger.error(f"Не удалось отправить электронное письмо {destination}: {str(e)}")
@@ -0,0 +1,405 @@
+import logging
+from datetime import timedelta
+from typing import List, Tuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from .config import get_config
+from .profiles import profile_cache
+from .base import SendDeferred
+from .registry import available_channels, get_sender
+from .suppression import suppression_list
+from ..models import NotificationLog, ChannelConfig, SuppressionEntry
+from ..profiling import stage
+
+
+logger = logging.getLogger(__name__)
+
+
+# Коды результата хранятся в NotificationLog.outcome
+Outcome = NotificationLog.Outcome
+
+
+class NotificationService:
+    """Сервис отправки уведомлений нескольким пользователям"""
+
+    DEFAULT_CHANNEL_PRIORITY = ['telegram', 'email', 'sms']
+
+    def __init__(self):
+        self.channel_priority = list(
+            getattr(settings, 'NOTIFICATION_CHANNEL_PRIORITY', self.DEFAULT_CHANNEL_PRIORITY)
+        )
+
+    def send_single_message(self, title: str, message: str,
+                          email: str = None, phone: str = None,
+                          telegram_chat_id: str = None,
+                          preferred_channel: str = None) -> Tuple[bool, str]:
+        """Отправить сообщение одному пользователю"""
+        config = ChannelConfig(
+            emails=[email] if email else [],
+            phones=[phone] if phone else [],
+            telegram_chat_ids=[telegram_chat_id] if telegram_chat_id else []
+        )
+
+        return self._send_to_channels(title, message, config, preferred_channel, single_recipient=True)
+
+    def quiet_until(self, email: str = None, phone: str = None, telegram_chat_id: str = None):
+        """Окончание тихих часов получателя или None, если отправлять можно сейчас"""
+        config = ChannelConfig(
+            emails=[email] if email else [],
+            phones=[phone] if phone else [],
+            telegram_chat_ids=[telegram_chat_id] if telegram_chat_id else []
+        )
+        profile = self._find_profile(config)
+        return profile.quiet_until() if profile else None
+
+    def send_bulk_message(self, title: str, message: str,
+                         emails: List[str] = None, phones: List[str] = None,
+                         telegram_chat_ids: List[str] = None,
+                         preferred_channel: str = None,
+                         batch_id: str = None, compact: bool = False,
+                         progress_callback=None, progress_every: int = 100) -> dict:
+        """Отправить сообщение нескольким пользователям
+
+        В компактном режиме вместо details возвращаются счетчики по кодам
+        Outcome, а результаты по получателям остаются в NotificationLog.
+        progress_callback(results) вызывается каждые progress_every получателей.
+        Получатели в тихие часы попадают в results['deferred'] и не отправляются.
+        Канал для каждого списка контактов выбирает _bulk_channel.
+        """
+        config = ChannelConfig(
+            emails=emails or [],
+            phones=phones or [],
+            telegram_chat_ids=telegram_chat_ids or []
+        )
+
+        results = {
+            'total_recipients': len(emails or []) + len(phones or []) + len(telegram_chat_ids or []),
+            'successful': 0,
+            'failed': 0,
+            # Список блокировки или отказ получателя от канала; отложенные из-за тихих часов
+            'skipped': 0,
+            'deferred': [],
+        }
+        if compact:
+            # Только счетчики; подробности - в NotificationLog по batch_id
+            results['batch_id'] = batch_id
+            results['outcomes'] = {}
+        else:
+            results['details'] = []
+
+        contacts = [
+            (contact_field, self._bulk_channel(contact_field, preferred_channel), config.get_destinations(contact_field))
+            for contact_field in ChannelConfig.CONTACT_LISTS
+        ]
+        sms_recipients = sum(
+            len(destinations) for _, channel, destinations in contacts if channel == NotificationLog.Channel.SMS
+        )
+        if sms_recipients:
+            results['sms'] = self._project_sms(title, message, sms_recipients)
+
+        chunk_size = getattr(settings, 'NOTIFICATION_PROFILE_PREFETCH_CHUNK', 1000)
+        processed = 0
+        for contact_field, channel, destinations in contacts:
+            for start in range(0, len(destinations), chunk_size):
+                chunk = destinations[start:start + chunk_size]
+                # Профили получателей чанка загружаются одним запросом
+                with stage('profile_lookup'):
+                    profile_cache.prefetch(contact_field, chunk)
+                # Записи лога для пропущенных получателей сохраняются одним запросом на чанк
+                skipped_logs = []
+
+                for destination in chunk:
+                    with stage('profile_lookup'):
+                        profile = profile_cache.get(contact_field, destination)
+                        resume_at = profile.quiet_until() if profile else None
+                    with stage('suppression_check'):
+                        suppressed = suppression_list.contains(channel, destination)
+
+                    code = None
+                    if suppressed:
+                        code = Outcome.SUPPRESSED
+                        message_result = f"Контакт {destination} в списке блокировки для {channel}"
+                        results['skipped'] += 1
+                    elif profile and profile.is_opted_out(channel):
+                        code = Outcome.OPTED_OUT
+                        message_result = f"Получатель {destination} отказался от сообщений через {channel}"
+                        results['skipped'] += 1
+                    elif resume_at:
+                        code = Outcome.DEFERRED
+                        message_result = f"Тихие часы получателя {destination}, отправка отложена до {resume_at.isoformat()}"
+                        results['deferred'].append({
+                            'contact': destination,
+                            'channel': channel,
+                            'resume_at': resume_at.isoformat()
+                        })
+
+                    if code:
+                        # Провайдер не вызывался, но получатель остается в логе рассылки
+                        success = False
+                        skipped_logs.append(NotificationLog.build_log(
+                            channel, NotificationLog.Status.SKIPPED, title, message,
+                            error_message=message_result, batch_id=batch_id, outcome=code,
+                            **{contact_field: destination}
+                        ))
+                    else:
+                        code, detail = self._deliver(title, message, channel, destination, batch_id)
+                        success = code == Outcome.SENT
+                        if code == Outcome.DEFERRED:
+                            # Учетная запись провайдера на паузе - повторим позже
+                            results['deferred'].append({
+                                'contact': destination,
+                                'channel': channel,
+                                'resume_at': detail.isoformat()
+                            })
+                        if not compact:
+                            message_result = self._describe(code, detail, channel, destination)
+
+                    if compact:
+                        results['outcomes'][code] = results['outcomes'].get(code, 0) + 1
+                    else:
+                        with stage('format_details'):
+                            results['details'].append({
+                                'contact': destination,
+                                'channel': channel,
+                                'success': success,
+                                'message': message_result
+                            })
+                    if success:
+                        results['successful'] += 1
+                    elif code not in Outcome.SKIPPED:
+                        results['failed'] += 1
+
+                    processed += 1
+                    if progress_callback and progress_every and processed % progress_every == 0:
+                        progress_callback(results)
+
+                if skipped_logs:
+                    with stage('log_insert'):
+                        NotificationLog.objects.bulk_create(skipped_logs)
+
+        return results
+
+    def _bulk_channel(self, contact_field: str, preferred_channel: str = None):
+        """Канал для списка контактов: preferred_channel, если он отправляет на это поле,
+        иначе первый подходящий по NOTIFICATION_CHANNEL_PRIORITY и NOTIFICATION_SENDERS.
+        Если подходящего нет, возвращается стандартный (отключенный) канал поля"""
+        candidates = ([preferred_channel] if preferred_channel else []) + self.channel_priority + available_channels()
+        for channel in candidates:
+            sender = get_sender(channel)
+            if sender is not None and sender.contact_field == contact_field:
+                return channel
+        return ChannelConfig.DEFAULT_CHANNELS[contact_field]
+
+    def project_bulk_sms(self, title: str, message: str,
+                         emails: List[str] = None, phones: List[str] = None,
+                         telegram_chat_ids: List[str] = None,
+                         preferred_channel: str = None) -> dict:
+        """Сегменты и стоимость SMS массовой отправки без отправки; пустой словарь, если SMS не будет"""
+        config = ChannelConfig(
+            emails=emails or [],
+            phones=phones or [],
+            telegram_chat_ids=telegram_chat_ids or []
+        )
+        recipients = sum(
+            len(config.get_destinations(contact_field))
+            for contact_field in ChannelConfig.CONTACT_LISTS
+            if self._bulk_channel(contact_field, preferred_channel) == NotificationLog.Channel.SMS
+        )
+        return self._project_sms(title, message, recipients) if recipients else {}
+
+    def _project_sms(self, title: str, message: str, recipients: int) -> dict:
+        """Расчет сегментов и стоимости SMS до начала отправки"""
+        sender = get_sender('sms')
+        if sender is None:
+            return {}
+        config = get_config()
+        info = sender.prepare_message(title, message, config)
+        segments_total = info.segments * recipients
+        projection = {
+            'encoding': info.encoding,
+            'length': info.length,
+            'segments_per_message': info.segments,
+            'segments_total': segments_total,
+        }
+        if config.sms_segment_price is not None:
+            projection['estimated_cost'] = round(config.sms_segment_price * segments_total, 2)
+        return projection
+
+    def _send_to_single_contact(self, title: str, message: str, channel: str, 
+                              destination: str, preferred_channel: str = None,
+                              batch_id: str = None) -> Tuple[bool, str]:
+        """Отправить сообщение одному контакту через указанный канал"""
+        code, detail = self._deliver(title, message, channel, destination, batch_id)
+        return code == Outcome.SENT, self._describe(code, detail, channel, destination)
+
+    def _describe(self, code: str, detail, channel: str, destination: str) -> str:
+        """Текст результата отправки для details"""
+        with stage('format_details'):
+            if code == Outcome.SENT:
+                return f"Сообщение отправлено на {destination} через {channel}"
+            elif code == Outcome.UNSUPPORTED:
+                return f"Unsupported channel: {channel}"
+            elif code == Outcome.FAILED:
+                return f"Ошибка отправки на {destination} через {channel}: {detail}"
+            elif code == Outcome.DEFERRED:
+                return f"Отправка на {destination} через {channel} отложена до {detail.isoformat()}"
+            return detail
+
+    def _deliver(self, title: str, message: str, channel: str,
+                 destination: str, batch_id: str = None) -> Tuple[str, str]:
+        """Отправить и записать в лог
+
+        Возвращает (код Outcome, текст ошибки); для DEFERRED вместо текста -
+        время, после которого отправку можно повторить. Запись в логе
+        создается при любом результате.
+        """
+        logged = False
+        try:
+            sender = get_sender(channel)
+            if not sender:
+                self._log_outcome(Outcome.UNSUPPORTED, title, message, channel, destination, batch_id,
+                                  f"Unsupported channel: {channel}")
+                return Outcome.UNSUPPORTED, None
+
+            try:
+                with stage(f'provider_{channel}'):
+                    outcome = sender.send(destination, title, message)
+            except SendDeferred as e:
+                logger.info(f"Sending to {destination} via {channel} deferred for {e.retry_after:.0f}s: {e}")
+                resume_at = timezone.now() + timedelta(seconds=e.retry_after)
+                logged = True
+                self._log_outcome(Outcome.DEFERRED, title, message, channel, destination, batch_id,
+                                  f"{e}, отправка отложена до {resume_at.isoformat()}", sender.contact_field)
+                return Outcome.DEFERRED, resume_at
+            success, result = outcome[0], outcome[1]
+            error = None if success else result
+            provider_account = outcome[2] if len(outcome) > 2 else None
+
+            log_data = {}
+            if sender.contact_field:
+                log_data[sender.contact_field] = destination
+
+            with stage('log_insert'):
+                NotificationLog.create_log(
+                    channel_used=channel,
+                    status=NotificationLog.Status.SENT if success else NotificationLog.Status.FAILED,
+                    title=title,
+                    message=message,
+                    error_message=error,
+                    provider_message_id=result if success else None,
+                    provider_account=provider_account,
+                    batch_id=batch_id,
+                    **log_data
+                )
+            logged = True
+
+            # Адрес, недоступный навсегда, больше не получает сообщений по этому каналу
+            if not success and sender.is_permanent_failure(error):
+                suppression_list.add(
+                    channel, destination,
+                    reason=sender.suppression_reason or SuppressionEntry.Reason.MANUAL,
+                    error_message=error
+                )
+
+            return (Outcome.SENT, None) if success else (Outcome.FAILED, error)
+
+        except Exception as e:
+            logger.error(f"Error sending to {destination} via {channel}: {str(e)}")
+            if not logged:
+                self._log_outcome(Outcome.ERROR, title, message, channel, destination, batch_id, str(e))
+            return Outcome.ERROR, str(e)
+
+    def _log_outcome(self, code: str, title: str, message: str, channel: str, destination: str,
+                     batch_id: str = None, error: str = None, contact_field: str = None):
+        """Записать в лог получателя, которому сообщение не было отправлено"""
+        try:
+            if contact_field is None:
+                sender = get_sender(channel)
+                contact_field = sender.contact_field if sender else self._default_contact_field(channel)
+            with stage('log_insert'):
+                NotificationLog.create_log(
+                    channel_used=channel,
+                    status=NotificationLog.Status.SKIPPED if code in Outcome.SKIPPED else NotificationLog.Status.FAILED,
+                    title=title,
+                    message=message,
+                    error_message=error,
+                    batch_id=batch_id,
+                    outcome=code,
+                    **({contact_field: destination} if contact_field else {})
+                )
+        except Exception as e:
+            logger.error(f"Failed to log {code} for {destination} via {channel}: {str(e)}")
+
+    @staticmethod
+    def _default_contact_field(channel: str):
+        """Поле контакта стандартного канала (для отключенных каналов)"""
+        for contact_field, default_channel in ChannelConfig.DEFAULT_CHANNELS.items():
+            if default_channel == channel:
+                return contact_field
+        return None
+
+    def _find_profile(self, config: ChannelConfig):
+        """Профиль получателя по первому найденному контакту"""
+        for contact_field in ('email', 'phone', 'telegram_chat_id'):
+            for value in config.get_destinations(contact_field)[:1]:
+                profile = profile_cache.get(contact_field, value)
+                if profile:
+                    return profile
+        return None
+
+    def _send_to_channels(self, title: str, message: str, config: ChannelConfig,
+                         preferred_channel: str = None, single_recipient: bool = False) -> Tuple[bool, str]:
+        """ Отправка с через разные каналы (для одного пользователя)"""
+        profile = self._find_profile(config) if single_recipient else None
+        if profile:
+            resume_at = profile.quiet_until()
+            if resume_at:
+                return False, f"Тихие часы получателя, отправка отложена до {resume_at.isoformat()}"
+            # Порядок каналов получателя без каналов, от которых он отказался
+            channels_to_try = profile.get_channel_order(self.channel_priority)
+        else:
+            channels_to_try = self.channel_priority.copy()
+
+        if preferred_channel and preferred_channel in channels_to_try:
+            channels_to_try.remove(preferred_channel)
+            channels_to_try.insert(0, preferred_channel)
+
+        last_error = None
+
+        for channel in channels_to_try:
+            sender = get_sender(channel)
+            if sender is None:
+                continue
+
+            destinations = config.get_destinations(sender.contact_field)
+            if not destinations:
+                continue
+
+            # Для одного пользователя берем первый доступный контакт
+            destination = destinations[0] if single_recipient else None
+            if single_recipient and suppression_list.contains(channel, destination):
+                last_error = f"Контакт {destination} в списке блокировки для {channel}"
+                self._log_outcome(Outcome.SUPPRESSED, title, message, channel, destination,
+                                  error=last_error, contact_field=sender.contact_field)
+                continue
+            if single_recipient:
+                success, result = self._send_to_single_contact(
+                    title, message, channel, destination, preferred_channel
+                )
+                if success:
+                    return True, result
+                last_error = result
+            else:
+                # Для множественных получателей пробуем все каналы
+                for dest in destinations:
+                    success, result = self._send_to_single_contact(
+                        title, message, channel, dest, preferred_channel
+                    )
+                    if success and single_recipient:
+                        return True, result
+                    if not success:
+                        last_error = result
+
+        return False, last_error or "Не удалось отправить сообщение"
\ No newline at end of file
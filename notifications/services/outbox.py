@@ -0,0 +1,70 @@
+import logging
+import uuid
+
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+
+from ..models import OutboxMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(task, eta=None, **kwargs):
+    """Записать задачу в outbox вместо публикации в брокер
+
+    id задачи выдается сразу, поэтому его можно вернуть клиенту
+    до публикации. eta передается брокеру при публикации. Возвращает task_id.
+    """
+    task_id = str(uuid.uuid4())
+    with transaction.atomic():
+        OutboxMessage.objects.create(task_id=task_id, task_name=task.name, kwargs=kwargs, eta=eta)
+    return task_id
+
+
+def schedule(task, eta=None, **kwargs):
+    """Поставить задачу в очередь: через outbox при NOTIFICATION_USE_OUTBOX, иначе сразу в брокер
+
+    Возвращает task_id.
+    """
+    if getattr(settings, 'NOTIFICATION_USE_OUTBOX', False):
+        return enqueue(task, eta=eta, **kwargs)
+    return task.apply_async(kwargs=kwargs, eta=eta).id
+
+
+def relay(batch_size=500, max_batches=20):
+    """Опубликовать задачи из outbox пачками; возвращает число опубликованных
+
+    Строки блокируются через SKIP LOCKED, поэтому несколько ретрансляторов
+    не публикуют одну задачу одновременно. Строка удаляется только после
+    успешной публикации (at-least-once): при сбое между публикацией и
+    удалением задача будет опубликована повторно с тем же task_id.
+    """
+    published = 0
+    for _ in range(max_batches):
+        with transaction.atomic():
+            batch = list(
+                OutboxMessage.objects.select_for_update(skip_locked=True).order_by('id')[:batch_size]
+            )
+            if not batch:
+                break
+
+            sent_ids = []
+            for item in batch:
+                try:
+                    current_app.send_task(item.task_name, kwargs=item.kwargs, task_id=item.task_id, eta=item.eta)
+                except Exception as e:
+                    # Брокер недоступен - оставшиеся задачи ждут следующего запуска
+                    logger.error(f"Outbox relay failed for task {item.task_id}: {str(e)}")
+                    OutboxMessage.objects.filter(id=item.id).update(
+                        attempts=item.attempts + 1, last_error=str(e)
+                    )
+                    break
+                sent_ids.append(item.id)
+
+            OutboxMessage.objects.filter(id__in=sent_ids).delete()
+            published += len(sent_ids)
+            if len(sent_ids) < len(batch):
+                break
+    return published
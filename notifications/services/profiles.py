@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from ..models import RecipientProfile
+
+
+_MISSING = object()
+
+
+class ProfileCache:
+    """LRU-кеш профилей получателей с TTL в памяти процесса
+
+    Ключ - (поле контакта, значение). Отсутствие профиля тоже кешируется,
+    чтобы получатели без профиля не порождали запросов при каждой отправке.
+    """
+
+    def __init__(self, max_size=10000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_cached(self, key):
+        item = self._items.get(key)
+        if item is None:
+            return _MISSING
+        expires_at, profile = item
+        if expires_at < time.monotonic():
+            self._items.pop(key, None)
+            return _MISSING
+        self._items.move_to_end(key)
+        return profile
+
+    def _put(self, key, profile, expires_at):
+        self._items[key] = (expires_at, profile)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def prefetch(self, contact_field, values):
+        """Загрузить профили для списка контактов одним запросом"""
+        with self._lock:
+            missing = [
+                value for value in set(values)
+                if self._get_cached((contact_field, value)) is _MISSING
+            ]
+        if not missing:
+            return
+
+        found = {
+            getattr(profile, contact_field): profile
+            for profile in RecipientProfile.objects.filter(**{f"{contact_field}__in": missing})
+        }
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for value in missing:
+                self._put((contact_field, value), found.get(value), expires_at)
+
+    def get(self, contact_field, value):
+        """Профиль по контакту или None"""
+        if not value:
+            return None
+        with self._lock:
+            profile = self._get_cached((contact_field, value))
+        if profile is _MISSING:
+            self.prefetch(contact_field, [value])
+            with self._lock:
+                profile = self._get_cached((contact_field, value))
+        return None if profile is _MISSING else profile
+
+    def invalidate(self, profile):
+        """Удалить профиль из кеша (после изменения в этом процессе)"""
+        with self._lock:
+            for field in ('email', 'phone', 'telegram_chat_id'):
+                value = getattr(profile, field)
+                if value:
+                    self._items.pop((field, value), None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+profile_cache = ProfileCache(
+    max_size=getattr(settings, 'NOTIFICATION_PROFILE_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'NOTIFICATION_PROFILE_CACHE_TTL', 300),
+)
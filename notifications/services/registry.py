@@ -0,0 +1,72 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from ..validators import CONTACT_FIELDS
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_SENDERS = {
+    'email': 'notifications.services.email_sender.EmailSender',
+    'sms': 'notifications.services.sms_sender.SMSSender',
+    'telegram': 'notifications.services.telegram_sender.TelegramSender',
+}
+
+_instances = {}
+_lock = threading.Lock()
+
+
+def get_sender_paths():
+    """Пути к классам отправщиков: стандартные каналы плюс NOTIFICATION_SENDERS
+
+    Значение None в NOTIFICATION_SENDERS отключает канал.
+    """
+    paths = {**DEFAULT_SENDERS, **getattr(settings, 'NOTIFICATION_SENDERS', {})}
+    return {channel: path for channel, path in paths.items() if path}
+
+
+def available_channels():
+    """Список подключенных каналов"""
+    return list(get_sender_paths())
+
+
+def get_sender(channel):
+    """Отправщик канала; создается при первом обращении и кешируется на процесс
+
+    Отправщик должен использовать одно из стандартных полей контакта
+    (CONTACT_FIELDS): по ним строятся списки получателей и записи лога.
+    Каналы со своим типом адреса (токен устройства, URL вебхука) плагином
+    не подключаются - для них нужно новое поле контакта в API, ChannelConfig
+    и NotificationLog.
+    """
+    sender = _instances.get(channel)
+    if sender is not None:
+        return sender
+
+    with _lock:
+        sender = _instances.get(channel)
+        if sender is None:
+            path = get_sender_paths().get(channel)
+            if not path:
+                return None
+            sender = import_string(path)()
+            if sender.contact_field not in CONTACT_FIELDS:
+                raise ImproperlyConfigured(
+                    f"Sender {path} for channel {channel!r} must set contact_field "
+                    f"to one of {', '.join(CONTACT_FIELDS)}; channels with other address types "
+                    f"(device tokens, webhook URLs) need a new contact field in the service"
+                )
+            _instances[channel] = sender
+            logger.debug(f"Sender for channel {channel} loaded from {path}")
+    return sender
+
+
+def reset_senders():
+    """Сбросить кеш отправщиков (вызывается при изменении NOTIFICATION_SENDERS)"""
+    with _lock:
+        _instances.clear()
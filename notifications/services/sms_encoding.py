@@ -0,0 +1,148 @@
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+
+GSM7 = 'gsm7'
+UCS2 = 'ucs2'
+
+# Базовая таблица GSM 03.38 (без символа escape)
+GSM7_BASIC = frozenset(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+# Расширенная таблица: каждый символ занимает две позиции (escape + символ)
+GSM7_EXTENDED = frozenset("^{}\\[~]|€\f")
+
+# Лимиты (одно сообщение, часть составного сообщения)
+SEGMENT_LIMITS = {
+    GSM7: (160, 153),
+    UCS2: (70, 67),
+}
+
+FIT_TRUNCATE = 'truncate'
+FIT_TRANSLITERATE = 'transliterate'
+
+TRANSLIT_MAP = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'e',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    '«': '"', '»': '"', '—': '-', '–': '-', '…': '...', '№': 'N',
+}
+TRANSLIT_MAP.update({
+    key.upper(): value.capitalize()
+    for key, value in list(TRANSLIT_MAP.items())
+    if key.isalpha()
+})
+
+
+class SMSInfo(NamedTuple):
+    """Результат анализа текста SMS"""
+    text: str
+    encoding: str
+    length: int
+    segments: int
+
+
+def _char_units(char: str, encoding: str) -> int:
+    """Количество позиций, которое символ занимает в сегменте"""
+    if encoding == GSM7:
+        return 2 if char in GSM7_EXTENDED else 1
+    # Символы вне BMP кодируются суррогатной парой
+    return 2 if ord(char) > 0xFFFF else 1
+
+
+def detect_encoding(text: str) -> str:
+    """Определить кодировку: GSM-7, если все символы из таблицы GSM, иначе UCS-2"""
+    for char in text:
+        if char not in GSM7_BASIC and char not in GSM7_EXTENDED:
+            return UCS2
+    return GSM7
+
+
+def count_segments(text: str, encoding: str) -> int:
+    """Количество тарифицируемых сегментов текста
+
+    В составном сообщении escape-пара GSM-7 и суррогатная пара UCS-2
+    не разрываются между частями: такой символ целиком переносится
+    в следующую часть, поэтому считать по общей длине нельзя.
+    """
+    single, multi = SEGMENT_LIMITS[encoding]
+    units = [_char_units(char, encoding) for char in text]
+    if sum(units) <= single:
+        return 1
+
+    segments, used = 1, 0
+    for size in units:
+        if used + size > multi:
+            segments += 1
+            used = 0
+        used += size
+    return segments
+
+
+@lru_cache(maxsize=256)
+def analyze(text: str) -> SMSInfo:
+    """Определить кодировку, длину и число сегментов"""
+    encoding = detect_encoding(text)
+    length = sum(_char_units(char, encoding) for char in text)
+    return SMSInfo(text, encoding, length, count_segments(text, encoding))
+
+
+def transliterate(text: str) -> str:
+    """Транслитерация в латиницу; неизвестные символы заменяются на '?'"""
+    result = []
+    for char in text:
+        char = TRANSLIT_MAP.get(char, char)
+        if all(c in GSM7_BASIC or c in GSM7_EXTENDED for c in char):
+            result.append(char)
+        else:
+            result.append('?')
+    return ''.join(result)
+
+
+def truncate(text: str, max_segments: int) -> str:
+    """Обрезать текст так, чтобы он уместился в max_segments сегментов"""
+    encoding = detect_encoding(text)
+    single, multi = SEGMENT_LIMITS[encoding]
+
+    units = 0
+    if max_segments <= 1:
+        for index, char in enumerate(text):
+            units += _char_units(char, encoding)
+            if units > single:
+                return text[:index]
+        return text
+
+    if sum(_char_units(char, encoding) for char in text) <= single:
+        return text
+
+    # Раскладываем по частям так же, как count_segments
+    segments = 1
+    for index, char in enumerate(text):
+        size = _char_units(char, encoding)
+        if units + size > multi:
+            segments += 1
+            units = 0
+            if segments > max_segments:
+                return text[:index]
+        units += size
+    return text
+
+
+@lru_cache(maxsize=256)
+def fit(text: str, max_segments: Optional[int] = None, mode: Optional[str] = None) -> SMSInfo:
+    """Подготовить текст SMS с учетом бюджета сегментов"""
+    info = analyze(text)
+    over_budget = bool(max_segments) and info.segments > max_segments
+
+    # Без бюджета транслитерируем всегда: GSM-7 вмещает вдвое больше символов
+    if mode == FIT_TRANSLITERATE and info.encoding == UCS2 and (over_budget or not max_segments):
+        info = analyze(transliterate(text))
+        over_budget = bool(max_segments) and info.segments > max_segments
+
+    if mode in (FIT_TRUNCATE, FIT_TRANSLITERATE) and over_budget:
+        info = analyze(truncate(info.text, max_segments))
+
+    return info
@@ -1,9 +1,10 @@
 import logging
 import requests
 
-from django.conf import settings
-
+from .accounts import health
 from .base import BaseSender
+from .config import get_config
+from .sms_encoding import fit
 
 
 logger = logging.getLogger(__name__)
@@ -11,32 +12,58 @@ logger = logging.getLogger(__name__)
 
 class SMSSender(BaseSender):
     """Отправка сообщений по sms"""
+    contact_field = 'phone'
+    # 202 - неверный номер, 207 - нет маршрута доставки на номер
+    permanent_errors = ('(код 202)', '(код 207)')
+    suppression_reason = 'invalid'
+
+    def prepare_message(self, title, message, config=None):
+        """Собрать текст SMS и рассчитать кодировку и число сегментов"""
+        config = config or get_config()
+        sms_message = f"{title}: {message}" if title else message
+        return fit(sms_message, config.sms_max_segments, config.sms_fit_mode)
+
     def send(self, destination, title, message):
+        account = None
         try:
             self.validate_destination(destination)
 
-            api_id = getattr(settings, 'SMSRU_API_ID', '')
-            if not api_id:
+            config = get_config()
+            if not config.smsru_accounts:
                 return False, "Служба SMS не настроена"
 
-            sms_message = f"{title}: {message}" if title else message
+            account = config.smsru_accounts.choose(destination)
+            sms_message = self.prepare_message(title, message, config).text
 
-            url = "https://sms.ru/sms/send"
             params = {
-                'api_id': api_id,
+                'api_id': account.secret,
                 'to': destination,
                 'msg': sms_message,
                 'json': 1
             }
 
-            response = requests.get(url, params=params, timeout=10)
-            data = response.json()
+            try:
+                response = requests.get(config.smsru_api_url, params=params, timeout=config.smsru_timeout)
+                data = response.json()
+            except Exception:
+                health.record_failure(account.label)
+                raise
+
+            # Ошибка верхнего уровня относится к учетной записи (баланс, лимиты)
+            if data.get('status') != 'OK':
+                health.record_failure(account.label)
+                return False, f"SMS ошибка: {data.get('status_text', 'Unknown error')}", account.label
+            health.record_success(account.label)
 
-            if data.get('status') == 'OK':
-                return True, None
-            else:
-                return False, f"SMS ошибка: {data.get('status_text', 'Unknown error')}"
+            # Статус по конкретному номеру и id сообщения для отчетов о доставке
+            sms_data = next(iter((data.get('sms') or {}).values()), {})
+            if sms_data.get('status') == 'ERROR':
+                return False, (
+                    f"SMS ошибка: {sms_data.get('status_text', 'Unknown error')} "
+                    f"(код {sms_data.get('status_code')})"
+                ), account.label
+            return True, sms_data.get('sms_id'), account.label
 
         except Exception as e:
             logger.error(f"Отправка СМС не удалась {destination}: {str(e)}")
-            return False, str(e)
\ No newline at end of file
+            return False, str(e), account.label if account else None
\ No newline at end of file
@@ -0,0 +1,96 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+from ..models import SuppressionEntry
+
+
+logger = logging.getLogger(__name__)
+
+
+class SuppressionList:
+    """Множество заблокированных контактов в памяти процесса
+
+    Проверка - поиск в set по (канал, контакт). Новые записи подгружаются
+    по id раз в refresh_interval секунд, полная перезагрузка (чтобы учесть
+    удаления) - раз в full_refresh_interval секунд.
+    """
+
+    def __init__(self, refresh_interval=30, full_refresh_interval=3600):
+        self.refresh_interval = refresh_interval
+        self.full_refresh_interval = full_refresh_interval
+        self._keys = set()
+        self._last_id = 0
+        self._refreshed_at = None
+        self._full_refreshed_at = None
+        self._lock = threading.Lock()
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            if self._refreshed_at is not None and now - self._refreshed_at < self.refresh_interval:
+                return
+
+            full = self._full_refreshed_at is None or now - self._full_refreshed_at >= self.full_refresh_interval
+            queryset = SuppressionEntry.objects.all()
+            if not full:
+                queryset = queryset.filter(id__gt=self._last_id)
+
+            keys = set() if full else self._keys
+            last_id = 0 if full else self._last_id
+            for entry_id, channel, contact in queryset.values_list('id', 'channel', 'contact').iterator():
+                keys.add((channel, contact))
+                last_id = max(last_id, entry_id)
+
+            # Замена множества целиком, чтобы параллельные проверки не видели пустой набор
+            self._keys = keys
+            self._last_id = last_id
+            self._refreshed_at = now
+            if full:
+                self._full_refreshed_at = now
+
+    def contains(self, channel, contact):
+        """Контакт заблокирован для канала"""
+        self._refresh()
+        return (channel, SuppressionEntry.normalize_contact(channel, contact)) in self._keys
+
+    def add(self, channel, contact, reason=SuppressionEntry.Reason.MANUAL, error_message=None):
+        """Добавить контакт в список (в базу и сразу в память процесса)"""
+        contact = SuppressionEntry.normalize_contact(channel, contact)
+        SuppressionEntry.objects.get_or_create(
+            channel=channel,
+            contact=contact,
+            defaults={'reason': reason, 'error_message': error_message}
+        )
+        self.remember(channel, contact)
+        logger.info(f"Contact suppressed for {channel} ({reason})")
+
+    def remember(self, channel, contact):
+        """Добавить контакт только в память процесса (запись уже сохранена)"""
+        self._keys.add((channel, SuppressionEntry.normalize_contact(channel, contact)))
+
+    def add_many(self, channel, contacts, reason):
+        """Добавить несколько контактов одним запросом"""
+        contacts = {SuppressionEntry.normalize_contact(channel, contact) for contact in contacts if contact}
+        SuppressionEntry.objects.bulk_create(
+            [SuppressionEntry(channel=channel, contact=contact, reason=reason) for contact in contacts],
+            ignore_conflicts=True
+        )
+        self._keys.update((channel, contact) for contact in contacts)
+
+    def invalidate(self):
+        """Полная перезагрузка при следующей проверке"""
+        with self._lock:
+            self._refreshed_at = None
+            self._full_refreshed_at = None
+
+
+suppression_list = SuppressionList(
+    refresh_interval=getattr(settings, 'NOTIFICATION_SUPPRESSION_REFRESH', 30),
+    full_refresh_interval=getattr(settings, 'NOTIFICATION_SUPPRESSION_FULL_REFRESH', 3600),
+)
@@ -1,8 +1,10 @@
 import requests
 import logging
+import time
 
-from django.conf import settings
-from .base import BaseSender
+from .accounts import health
+from .base import BaseSender, SendDeferred
+from .config import get_config
 
 
 logger = logging.getLogger(__name__)
@@ -10,32 +12,111 @@ logger = logging.getLogger(__name__)
 
 class TelegramSender(BaseSender):
     """Отправка сообщений в telegram"""
+    contact_field = 'telegram_chat_id'
+    permanent_errors = (
+        'bot was blocked by the user',
+        'user is deactivated',
+        'chat not found',
+        'bot was kicked',
+    )
+    suppression_reason = 'blocked'
+    # Ошибки пары бот-чат: другой бот пула может быть запущен в этом чате
+    BOT_SPECIFIC_ERRORS = (
+        'bot was blocked by the user',
+        'chat not found',
+        'bot was kicked',
+        "bot can't initiate conversation",
+    )
+
+    # Попыток отправки от бота, получившего лимит (HTTP 429)
+    MAX_ATTEMPTS = 3
+
     def send(self, destination, title, message):
+        account = None
         try:
             self.validate_destination(destination)
 
-            bot_token = getattr(settings, 'TELEGRAM_BOT_TOKEN', '')
-            if not bot_token:
+            config = get_config()
+            if not config.telegram_accounts:
                 return False, "Токен бота Telegram не настроен"
 
             formatted_message = f"*{title}*\n{message}" if title else message
 
-            url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
             payload = {
                 'chat_id': destination,
                 'text': formatted_message,
                 'parse_mode': 'Markdown'
             }
 
-            response = requests.post(url, json=payload, timeout=10)
-            response.raise_for_status()
+            # Чат закрепляется за ботом хешированием, но писать можно только от бота, запущенного
+            # в чате (например, чаты до добавления токенов знают только первого бота). Если
+            # закрепленный бот в чате не запущен, пробуются остальные боты пула по порядку
+            for account in config.telegram_accounts.ranked(destination):
+                response = self._post(account, payload, config)
+
+                # 5xx - проблемы бота, 4xx относятся к получателю
+                if response.status_code >= 500:
+                    health.record_failure(account.label)
+                else:
+                    health.record_success(account.label)
+                # На 4xx Telegram возвращает JSON с описанием ошибки
+                if response.status_code >= 500:
+                    response.raise_for_status()
 
-            data = response.json()
-            if data.get('ok'):
-                return True, None
-            else:
-                return False, f"Telegram API ошибка: {data.get('description', 'Unknown error')}"
+                data = response.json()
+                if data.get('ok'):
+                    # message_id уникален только в пределах чата
+                    message_id = (data.get('result') or {}).get('message_id')
+                    return True, f"{destination}:{message_id}" if message_id else None, account.label
 
+                error = f"Telegram API ошибка: {data.get('description', 'Unknown error')}"
+                if not self._is_bot_specific(error):
+                    break
+            return False, error, account.label
+
+        except SendDeferred:
+            raise
         except Exception as e:
             logger.error(f"Telegram отправка не удалась {destination}: {str(e)}")
-            return False, str(e)
\ No newline at end of file
+            return False, str(e), account.label if account else None
+
+    def is_permanent_failure(self, error):
+        """Ошибку одного бота из нескольких нельзя считать недоступностью чата
+
+        Запись в список блокировки действует для всех ботов, поэтому при пуле
+        из нескольких ботов постоянными считаются только ошибки самого получателя
+        (например, удаленный аккаунт).
+        """
+        if not super().is_permanent_failure(error):
+            return False
+        return len(get_config().telegram_accounts) <= 1 or not self._is_bot_specific(error)
+
+    def _is_bot_specific(self, error):
+        return any(marker in error for marker in self.BOT_SPECIFIC_ERRORS)
+
+    def _post(self, account, payload, config):
+        """Запрос от закрепленного за чатом бота
+
+        Другой бот чату писать не может, поэтому пауза бота (лимит или ошибки
+        подряд) выжидается, если она не длиннее TELEGRAM_MAX_WAIT, иначе
+        отправка откладывается через SendDeferred.
+        """
+        for attempt in range(self.MAX_ATTEMPTS):
+            wait = health.cooldown_remaining(account.label)
+            if wait > config.telegram_max_wait:
+                raise SendDeferred(wait, f"Бот {account.label} на паузе")
+            if wait:
+                time.sleep(wait)
+
+            try:
+                response = requests.post(account.secret, json=payload, timeout=config.telegram_timeout)
+            except Exception:
+                health.record_failure(account.label)
+                raise
+            if response.status_code != 429:
+                return response
+
+            retry_after = (response.json().get('parameters') or {}).get('retry_after')
+            health.record_failure(account.label, retry_after)
+
+        raise SendDeferred(health.cooldown_remaining(account.label) or 1, f"Лимит бота {account.label}")
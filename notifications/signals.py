@@ -0,0 +1,32 @@
+from django.core.signals import setting_changed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import RecipientProfile, SuppressionEntry
+from .services.profiles import profile_cache
+from .services.registry import reset_senders
+from .services.suppression import suppression_list
+
+
+@receiver([post_save, post_delete], sender=RecipientProfile)
+def invalidate_profile_cache(sender, instance, **kwargs):
+    """Сбросить профиль в кеше текущего процесса; остальные процессы обновятся по TTL"""
+    profile_cache.invalidate(instance)
+
+
+@receiver(post_save, sender=SuppressionEntry)
+def remember_suppression(sender, instance, **kwargs):
+    suppression_list.remember(instance.channel, instance.contact)
+
+
+@receiver(post_delete, sender=SuppressionEntry)
+def reload_suppression(sender, instance, **kwargs):
+    """Удаление учитывается полной перезагрузкой списка при следующей проверке"""
+    suppression_list.invalidate()
+
+
+@receiver(setting_changed)
+def reset_senders_on_change(setting, **kwargs):
+    """Пересоздать отправщики после изменения NOTIFICATION_SENDERS (override_settings)"""
+    if setting == 'NOTIFICATION_SENDERS':
+        reset_senders()
@@ -1,14 +1,28 @@
+import json
 import logging
+from datetime import datetime, timedelta
 
 from celery import shared_task
+from django.conf import settings
 
+from .models import ChannelConfig
+from .profiling import profile_session, profiling_enabled, stage
+from .services import outbox
+from .services.registry import get_sender
 from .services.notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task
+def _profile_requested(request):
+    """Профилировать задачу: настройка NOTIFICATION_PROFILING или заголовок profile"""
+    headers = getattr(request, 'headers', None) or {}
+    return profiling_enabled() or bool(getattr(request, 'profile', None) or headers.get('profile'))
+
+
+@shared_task(bind=True)
 def send_single_message_task(
+    self,
     title,
     message,
     email=None,
@@ -16,9 +30,42 @@ def send_single_message_task(
     telegram_chat_id=None,
     preferred_channel=None
 ):
-    """Асинхронная отправка сообщения одному пользователю"""
+    """Асинхронная отправка сообщения одному пользователю
+
+    Профилирование включается так же, как для send_bulk_message_task.
+    """
+    if _profile_requested(self.request):
+        with profile_session(f"send_single_message_task-{self.request.id or 'local'}") as paths:
+            result = _send_single(title, message, email, phone, telegram_chat_id, preferred_channel)
+        if paths:
+            result['profile'] = paths
+        return result
+
+    return _send_single(title, message, email, phone, telegram_chat_id, preferred_channel)
+
+
+def _send_single(title, message, email, phone, telegram_chat_id, preferred_channel):
     try:
         service = NotificationService()
+
+        # В тихие часы получателя задача переносится на их окончание
+        resume_at = service.quiet_until(email=email, phone=phone, telegram_chat_id=telegram_chat_id)
+        if resume_at:
+            task = send_single_message_task.apply_async(kwargs={
+                'title': title,
+                'message': message,
+                'email': email,
+                'phone': phone,
+                'telegram_chat_id': telegram_chat_id,
+                'preferred_channel': preferred_channel,
+            }, eta=resume_at)
+            return {
+                'status': 'deferred',
+                'task_id': task.id,
+                'resume_at': resume_at.isoformat(),
+                'type': 'single'
+            }
+
         success, result = service.send_single_message(
             title=title,
             message=message,
@@ -43,16 +90,61 @@ def send_single_message_task(
         }
 
 
-@shared_task
+@shared_task(bind=True)
 def send_bulk_message_task(
+    self,
     title,
     message,
     emails=None,
     phones=None,
     telegram_chat_ids=None,
-    preferred_channel=None
+    preferred_channel=None,
+    compact=None,
+    batch_id=None
 ):
-    """Асинхронная массовая отправка сообщений"""
+    """Асинхронная массовая отправка сообщений
+
+    В компактном режиме результат задачи содержит только счетчики и batch_id,
+    по которому подробности доступны в /logs/?batch_id=... batch_id по умолчанию -
+    id задачи; отложенные получатели отправляются с batch_id исходной рассылки.
+
+    Профилирование включается настройкой NOTIFICATION_PROFILING или
+    заголовком задачи profile (apply_async(..., headers={'profile': True})).
+    """
+    if compact is None:
+        compact = getattr(settings, 'NOTIFICATION_COMPACT_TASK_RESULTS', False)
+    batch_id = batch_id or self.request.id
+
+    def report_progress(results):
+        # Промежуточный прогресс для /tasks/<task_id>/
+        if self.request.id:
+            self.update_state(state='PROGRESS', meta={
+                'total': results['total_recipients'],
+                'processed': (
+                    results['successful'] + results['failed'] + results['skipped'] + len(results['deferred'])
+                ),
+                'successful': results['successful'],
+                'failed': results['failed'],
+            })
+
+    if _profile_requested(self.request):
+        with profile_session(f"send_bulk_message_task-{self.request.id or 'local'}") as paths:
+            result = _send_bulk(
+                title, message, emails, phones, telegram_chat_ids, preferred_channel, compact, batch_id, report_progress
+            )
+            if result['status'] == 'success':
+                with stage('result_serialization'):
+                    json.dumps(result)
+        if paths:
+            result['profile'] = paths
+        return result
+
+    return _send_bulk(
+        title, message, emails, phones, telegram_chat_ids, preferred_channel, compact, batch_id, report_progress
+    )
+
+
+def _send_bulk(title, message, emails, phones, telegram_chat_ids, preferred_channel, compact, batch_id, report_progress):
     try:
         service = NotificationService()
         results = service.send_bulk_message(
@@ -61,7 +153,14 @@ def send_bulk_message_task(
             emails=emails or [],
             phones=phones or [],
             telegram_chat_ids=telegram_chat_ids or [],
-            preferred_channel=preferred_channel
+            preferred_channel=preferred_channel,
+            batch_id=batch_id,
+            compact=compact,
+            progress_callback=report_progress,
+            progress_every=getattr(settings, 'NOTIFICATION_PROGRESS_EVERY', 100)
+        )
+        results['deferred_task_ids'] = schedule_deferred(
+            results.pop('deferred'), title, message, preferred_channel, compact, batch_id
         )
 
         return {
@@ -76,4 +175,50 @@ def send_bulk_message_task(
             'status': 'error',
             'message': str(e),
             'type': 'bulk'
-        }
\ No newline at end of file
+        }
+
+
+@shared_task(ignore_result=True)
+def relay_outbox_task():
+    """Публикация задач из outbox в брокер (запускается Celery beat)"""
+    published = outbox.relay(
+        batch_size=getattr(settings, 'NOTIFICATION_OUTBOX_BATCH_SIZE', 500),
+        max_batches=getattr(settings, 'NOTIFICATION_OUTBOX_MAX_BATCHES', 20)
+    )
+    if published:
+        logger.info(f"Outbox relay published {published} tasks")
+    return published
+
+
+def schedule_deferred(deferred, title, message, preferred_channel=None, compact=None, batch_id=None):
+    """Поставить отложенных получателей в очередь
+
+    Получатели группируются по моменту возобновления, округленному вверх
+    до минуты; на каждую группу создается одна массовая задача с eta
+    и batch_id исходной рассылки (через outbox, если он включен).
+    Возвращает id задач.
+    """
+    groups = {}
+    for item in deferred:
+        sender = get_sender(item['channel'])
+        list_name = ChannelConfig.CONTACT_LISTS.get(sender.contact_field) if sender else None
+        if list_name:
+            resume_at = datetime.fromisoformat(item['resume_at'])
+            if resume_at.second or resume_at.microsecond:
+                resume_at = resume_at.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            group = groups.setdefault(resume_at, {'emails': [], 'phones': [], 'telegram_chat_ids': []})
+            group[list_name].append(item['contact'])
+
+    return [
+        outbox.schedule(
+            send_bulk_message_task,
+            eta=resume_at,
+            title=title,
+            message=message,
+            preferred_channel=preferred_channel,
+            compact=compact,
+            batch_id=batch_id,
+            **contacts
+        )
+        for resume_at, contacts in groups.items()
+    ]
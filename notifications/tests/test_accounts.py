@@ -0,0 +1,163 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from notifications.models import SuppressionEntry
+from notifications.services.accounts import Account, AccountHealth, AccountPool
+from notifications.services.base import SendDeferred
+from notifications.services.config import get_config
+from notifications.services.notification_service import NotificationService, Outcome
+from notifications.services.suppression import suppression_list
+from notifications.services.telegram_sender import TelegramSender
+
+
+ACCOUNTS = (Account('a', 'a'), Account('b', 'b'), Account('c', 'c'))
+KEYS = [str(100000 + n) for n in range(3000)]
+
+
+class FakeResponse:
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.data = data
+
+    def json(self):
+        return self.data
+
+    def raise_for_status(self):
+        pass
+
+
+class AccountPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.health = AccountHealth()
+        patcher = mock.patch('notifications.services.accounts.health', self.health)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assignment(self, pool):
+        return {key: pool.choose(key).label for key in KEYS}
+
+    def test_choice_is_stable_and_follows_weights(self):
+        pool = AccountPool(ACCOUNTS[:2] + (Account('c', 'c', weight=2.0),))
+        first = self.assignment(pool)
+        self.assertEqual(first, self.assignment(pool))
+        counts = {label: list(first.values()).count(label) for label in 'abc'}
+        self.assertGreater(counts['c'], counts['a'] * 1.5)
+        self.assertGreater(counts['c'], counts['b'] * 1.5)
+
+    def test_health_moves_only_recipients_of_failing_account(self):
+        pool = AccountPool(ACCOUNTS)
+        before = self.assignment(pool)
+        for _ in range(AccountHealth.FAILURE_THRESHOLD):
+            self.health.record_failure('a')
+        after = self.assignment(pool)
+
+        self.assertFalse([key for key in KEYS if after[key] == 'a'])
+        self.assertFalse([key for key in KEYS if before[key] != 'a' and after[key] != before[key]])
+
+    def test_sticky_pool_ignores_health(self):
+        pool = AccountPool(ACCOUNTS, sticky=True)
+        before = self.assignment(pool)
+        self.health.record_failure('a')
+        self.health.record_failure('b', retry_after=60)
+        self.assertEqual(before, self.assignment(pool))
+
+
+@override_settings(TELEGRAM_BOT_TOKENS='1:x,2:y,3:z', TELEGRAM_MAX_WAIT=5)
+class TelegramStickyBotTests(TestCase):
+    def setUp(self):
+        self.health = AccountHealth()
+        for target in ('notifications.services.accounts.health', 'notifications.services.telegram_sender.health'):
+            patcher = mock.patch(target, self.health)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.sender = TelegramSender()
+        self.account = get_config().telegram_accounts.choose('42')
+
+    def test_config_pool_is_sticky(self):
+        self.assertTrue(get_config().telegram_accounts.sticky)
+
+    @mock.patch('notifications.services.telegram_sender.time.sleep')
+    @mock.patch('notifications.services.telegram_sender.requests.post')
+    def test_short_rate_limit_is_retried_with_same_bot(self, post, sleep):
+        post.side_effect = [
+            FakeResponse(429, {'ok': False, 'parameters': {'retry_after': 2}}),
+            FakeResponse(200, {'ok': True, 'result': {'message_id': 7}}),
+        ]
+        success, message_id, label = self.sender.send('42', 't', 'm')
+
+        self.assertEqual((success, message_id, label), (True, '42:7', self.account.label))
+        self.assertEqual({call.args[0] for call in post.call_args_list}, {self.account.secret})
+        sleep.assert_called_once()
+
+    @mock.patch('notifications.services.telegram_sender.requests.post')
+    def test_long_cooldown_defers(self, post):
+        self.health.record_failure(self.account.label, retry_after=120)
+        with self.assertRaises(SendDeferred):
+            self.sender.send('42', 't', 'm')
+        post.assert_not_called()
+
+    @mock.patch('notifications.services.telegram_sender.requests.post')
+    def test_bulk_send_defers_recipient_of_paused_bot(self, post):
+        self.health.record_failure(self.account.label, retry_after=120)
+        results = NotificationService().send_bulk_message(
+            title='t', message='m', telegram_chat_ids=['42'], compact=True
+        )
+        self.assertEqual(results['outcomes'], {Outcome.DEFERRED: 1})
+        self.assertEqual(results['failed'], 0)
+        self.assertEqual(results['deferred'][0]['contact'], '42')
+
+
+@override_settings(TELEGRAM_BOT_TOKENS='1:x,2:y,3:z')
+class TelegramBotPoolFallbackTests(TestCase):
+    def setUp(self):
+        self.health = AccountHealth()
+        for target in ('notifications.services.accounts.health', 'notifications.services.telegram_sender.health'):
+            patcher = mock.patch(target, self.health)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        suppression_list.invalidate()
+        self.addCleanup(suppression_list.invalidate)
+        self.ranked = get_config().telegram_accounts.ranked('42')
+
+    @mock.patch('notifications.services.telegram_sender.requests.post')
+    def test_falls_back_to_bot_started_in_chat(self, post):
+        post.side_effect = [
+            FakeResponse(400, {'ok': False, 'description': 'Bad Request: chat not found'}),
+            FakeResponse(200, {'ok': True, 'result': {'message_id': 7}}),
+        ]
+        success, message_id, label = TelegramSender().send('42', 't', 'm')
+
+        self.assertEqual((success, message_id, label), (True, '42:7', self.ranked[1].label))
+        self.assertEqual([call.args[0] for call in post.call_args_list], [a.secret for a in self.ranked[:2]])
+
+    @mock.patch('notifications.services.telegram_sender.requests.post')
+    def test_bot_specific_errors_do_not_suppress_chat_in_pool(self, post):
+        post.return_value = FakeResponse(403, {'ok': False, 'description': 'Forbidden: bot was blocked by the user'})
+
+        results = NotificationService().send_bulk_message(
+            title='t', message='m', telegram_chat_ids=['42'], compact=True
+        )
+
+        self.assertEqual(results['outcomes'], {Outcome.FAILED: 1})
+        self.assertEqual(post.call_count, 3)
+        self.assertFalse(SuppressionEntry.objects.filter(channel='telegram', contact='42').exists())
+        self.assertFalse(suppression_list.contains('telegram', '42'))
+
+    @mock.patch('notifications.services.telegram_sender.requests.post')
+    def test_recipient_errors_still_suppress_in_pool(self, post):
+        post.return_value = FakeResponse(403, {'ok': False, 'description': 'Forbidden: user is deactivated'})
+
+        NotificationService().send_bulk_message(title='t', message='m', telegram_chat_ids=['42'], compact=True)
+
+        self.assertEqual(post.call_count, 1)
+        self.assertTrue(SuppressionEntry.objects.filter(channel='telegram', contact='42').exists())
+
+    @override_settings(TELEGRAM_BOT_TOKENS='1:x')
+    @mock.patch('notifications.services.telegram_sender.requests.post')
+    def test_single_bot_chat_not_found_suppresses(self, post):
+        post.return_value = FakeResponse(400, {'ok': False, 'description': 'Bad Request: chat not found'})
+
+        NotificationService().send_bulk_message(title='t', message='m', telegram_chat_ids=['42'], compact=True)
+
+        self.assertTrue(SuppressionEntry.objects.filter(channel='telegram', contact='42').exists())
@@ -0,0 +1,46 @@
+import os
+import signal
+import tempfile
+import unittest
+
+from django.test import SimpleTestCase, override_settings
+
+from notifications.services.config import build_config, get_config, read_env_file, reload_config
+
+
+class SenderConfigReloadTests(SimpleTestCase):
+    def setUp(self):
+        env_file = tempfile.NamedTemporaryFile('w', suffix='.env', delete=False)
+        env_file.write(
+            "TELEGRAM_BOT_TOKENS=111:new,222:new\n"
+            "SMSRU_API_ID=new-key\n"
+            "SMS_MAX_SEGMENTS=2\n"
+            "SECRET_KEY=ignored\n"
+        )
+        env_file.close()
+        self.env_path = env_file.name
+        self.addCleanup(os.unlink, self.env_path)
+        self.addCleanup(reload_config)
+
+    def test_read_env_file_keeps_only_sender_settings(self):
+        values = read_env_file(self.env_path)
+        self.assertNotIn('SECRET_KEY', values)
+        self.assertEqual(values['SMSRU_API_ID'], 'new-key')
+
+    def test_env_file_values_override_settings(self):
+        with override_settings(TELEGRAM_BOT_TOKENS='', TELEGRAM_BOT_TOKEN='999:old', SMS_MAX_SEGMENTS=None):
+            config = build_config(read_env_file(self.env_path))
+        self.assertEqual([account.label for account in config.telegram_accounts.accounts], ['bot111', 'bot222'])
+        self.assertEqual(config.sms_max_segments, 2)
+        self.assertEqual(config.smsru_accounts.accounts[0].secret, 'new-key')
+
+    def test_missing_file_falls_back_to_settings(self):
+        with self.assertLogs('notifications.services.config', 'WARNING'):
+            self.assertEqual(read_env_file(self.env_path + '.missing'), {})
+
+    @unittest.skipUnless(hasattr(signal, 'SIGUSR2'), "SIGUSR2 недоступен")
+    def test_reload_signal_reads_env_file(self):
+        with override_settings(NOTIFICATION_CONFIG_ENV_FILE=self.env_path, TELEGRAM_BOT_TOKENS='999:old'):
+            self.assertEqual(get_config().telegram_accounts.accounts[0].label, 'bot999')
+            os.kill(os.getpid(), signal.SIGUSR2)
+            self.assertEqual(get_config().telegram_accounts.accounts[0].label, 'bot111')
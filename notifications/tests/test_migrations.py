@@ -0,0 +1,26 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+
+
+class MigrationsTests(TestCase):
+    def test_models_match_migrations(self):
+        # Состав индексов не зависит от СУБД, поэтому makemigrations ничего не находит
+        call_command('makemigrations', 'notifications', check=True, dry_run=True, stdout=StringIO())
+
+    def test_initial_migration_matches_baseline_log_table(self):
+        # На существующих установках таблица логов уже есть: 0001 должна совпадать с ней
+        # (migrate --fake-initial), все изменения - в следующих миграциях
+        state = MigrationLoader(None).project_state(('notifications', '0001_initial'))
+        self.assertEqual(list(state.models), [('notifications', 'notificationlog')])
+        fields = state.models['notifications', 'notificationlog'].fields
+        self.assertEqual(list(fields), [
+            'id', 'email', 'phone', 'telegram_chat_id', 'title', 'message',
+            'channel_used', 'status', 'error_message', 'created_at',
+        ])
+
+    def test_log_indexes_are_built_outside_transaction(self):
+        migration = MigrationLoader(None).get_migration('notifications', '0003_notificationlog_indexes')
+        self.assertFalse(migration.atomic)
@@ -0,0 +1,106 @@
+from datetime import datetime, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notifications.models import OutboxMessage
+from notifications.services import outbox
+from notifications.services.config import reload_config
+from notifications.tasks import schedule_deferred, send_single_message_task
+
+ETA = datetime(2024, 3, 10, 8, tzinfo=dt_timezone.utc)
+
+
+class OutboxRelayTests(TestCase):
+    def test_enqueue_stores_eta(self):
+        task_id = outbox.enqueue(send_single_message_task, eta=ETA, title='t')
+
+        item = OutboxMessage.objects.get(task_id=task_id)
+        self.assertEqual(item.task_name, send_single_message_task.name)
+        self.assertEqual(item.kwargs, {'title': 't'})
+        self.assertEqual(item.eta, ETA)
+
+    @mock.patch('notifications.services.outbox.current_app.send_task')
+    def test_relay_publishes_with_eta_and_deletes(self, send_task):
+        first = outbox.enqueue(send_single_message_task, eta=ETA, title='a')
+        second = outbox.enqueue(send_single_message_task, title='b')
+
+        self.assertEqual(outbox.relay(batch_size=1), 2)
+
+        self.assertFalse(OutboxMessage.objects.exists())
+        self.assertEqual(send_task.call_args_list, [
+            mock.call(send_single_message_task.name, kwargs={'title': 'a'}, task_id=first, eta=ETA),
+            mock.call(send_single_message_task.name, kwargs={'title': 'b'}, task_id=second, eta=None),
+        ])
+
+    @mock.patch('notifications.services.outbox.current_app.send_task', side_effect=ConnectionError('down'))
+    def test_broker_failure_keeps_row(self, send_task):
+        task_id = outbox.enqueue(send_single_message_task, title='a')
+
+        self.assertEqual(outbox.relay(), 0)
+
+        item = OutboxMessage.objects.get(task_id=task_id)
+        self.assertEqual(item.attempts, 1)
+        self.assertEqual(item.last_error, 'down')
+
+
+class OutboxScheduleTests(TestCase):
+    @override_settings(NOTIFICATION_USE_OUTBOX=False)
+    @mock.patch('notifications.tasks.send_single_message_task.apply_async')
+    def test_without_outbox_publishes_directly(self, apply_async):
+        apply_async.return_value.id = 'task-1'
+
+        self.assertEqual(outbox.schedule(send_single_message_task, eta=ETA, title='t'), 'task-1')
+        apply_async.assert_called_once_with(kwargs={'title': 't'}, eta=ETA)
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    @override_settings(NOTIFICATION_USE_OUTBOX=True)
+    @mock.patch('notifications.tasks.send_bulk_message_task.apply_async')
+    def test_deferred_bulk_goes_to_outbox(self, apply_async):
+        deferred = [{'contact': 'a@example.com', 'channel': 'email', 'resume_at': ETA.isoformat()}]
+
+        task_ids = schedule_deferred(deferred, 't', 'm', batch_id='batch-1')
+
+        apply_async.assert_not_called()
+        item = OutboxMessage.objects.get(task_id=task_ids[0])
+        self.assertEqual(item.eta, ETA)
+        self.assertEqual(item.kwargs['batch_id'], 'batch-1')
+        self.assertEqual(item.kwargs['emails'], ['a@example.com'])
+
+    @override_settings(NOTIFICATION_USE_OUTBOX=True)
+    @mock.patch('notifications.services.notification_service.NotificationService.quiet_until', return_value=ETA)
+    @mock.patch('notifications.tasks.send_single_message_task.apply_async')
+    def test_quiet_hours_single_goes_to_outbox(self, apply_async, quiet_until):
+        self.client.force_login(get_user_model().objects.create(username='api'))
+        response = self.client.post(
+            reverse('send-message'),
+            {'title': 't', 'message': 'm', 'email': 'a@example.com'},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 202)
+        apply_async.assert_not_called()
+        item = OutboxMessage.objects.get(task_id=response.json()['task_id'])
+        self.assertEqual(item.eta, ETA)
+
+
+class AsyncBulkProjectionTests(TestCase):
+    @override_settings(SMS_SEGMENT_PRICE='2.5')
+    @mock.patch('notifications.views.outbox.schedule', return_value='task-1')
+    def test_sms_projection_returned_before_dispatch(self, schedule):
+        self.addCleanup(reload_config)
+        reload_config()
+        self.client.force_login(get_user_model().objects.create(username='api'))
+
+        response = self.client.post(
+            reverse('send-message-async'),
+            {'title': 't', 'message': 'm' * 200, 'phones': ['+79161234567', '+79160000000'], 'emails': ['a@example.com']},
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['task_id'], 'task-1')
+        self.assertEqual(response.json()['sms']['segments_total'], 4)
+        self.assertEqual(response.json()['sms']['estimated_cost'], 10.0)
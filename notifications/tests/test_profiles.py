@@ -0,0 +1,72 @@
+from datetime import datetime, time, timezone as dt_timezone
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from notifications.models import RecipientProfile
+from notifications.services.profiles import profile_cache
+from notifications.tasks import schedule_deferred
+
+
+def utc(hour, minute=0):
+    return datetime(2024, 3, 10, hour, minute, tzinfo=dt_timezone.utc)
+
+
+class QuietHoursTests(SimpleTestCase):
+    def profile(self, start, end, tz='UTC'):
+        return RecipientProfile(timezone=tz, quiet_hours_start=start, quiet_hours_end=end)
+
+    def test_interval_within_day(self):
+        profile = self.profile(time(13), time(15))
+        self.assertIsNone(profile.quiet_until(utc(12, 59)))
+        self.assertEqual(profile.quiet_until(utc(13)), utc(15))
+        self.assertIsNone(profile.quiet_until(utc(15)))
+
+    def test_interval_wraps_midnight(self):
+        profile = self.profile(time(22), time(8))
+        self.assertEqual(profile.quiet_until(utc(23, 30)), datetime(2024, 3, 11, 8, tzinfo=dt_timezone.utc))
+        self.assertEqual(profile.quiet_until(utc(7, 59)), utc(8))
+        self.assertIsNone(profile.quiet_until(utc(12)))
+
+    def test_recipient_timezone(self):
+        # 20:00 UTC - 23:00 в Москве
+        resume = self.profile(time(22), time(8), 'Europe/Moscow').quiet_until(utc(20))
+        self.assertEqual(resume, datetime(2024, 3, 11, 5, tzinfo=dt_timezone.utc))
+
+    def test_empty_or_zero_length_interval(self):
+        self.assertIsNone(self.profile(None, time(8)).quiet_until(utc(3)))
+        self.assertIsNone(self.profile(time(8), time(8)).quiet_until(utc(8)))
+
+    def test_channel_order(self):
+        profile = RecipientProfile(channel_order=['sms', 'fax', 'email'], opted_out_channels=['email'])
+        self.assertEqual(profile.get_channel_order(['telegram', 'email', 'sms']), ['sms', 'telegram'])
+
+
+class ProfilePhoneTests(TestCase):
+    def setUp(self):
+        profile_cache.clear()
+        self.addCleanup(profile_cache.clear)
+
+    def test_phone_is_normalized_and_matched(self):
+        profile = RecipientProfile.objects.create(phone='8 (916) 123-45-67')
+        self.assertEqual(profile.phone, '+79161234567')
+        self.assertEqual(profile_cache.get('phone', '+79161234567'), profile)
+
+
+@override_settings(NOTIFICATION_USE_OUTBOX=False)
+class ScheduleDeferredTests(SimpleTestCase):
+    @mock.patch('notifications.tasks.send_bulk_message_task.apply_async')
+    def test_groups_by_minute_and_keeps_batch_id(self, apply_async):
+        deferred = [
+            {'contact': 'a@example.com', 'channel': 'email', 'resume_at': '2024-03-10T08:00:00+00:00'},
+            {'contact': '+79161234567', 'channel': 'sms', 'resume_at': '2024-03-10T07:59:30.5+00:00'},
+            {'contact': '42', 'channel': 'telegram', 'resume_at': '2024-03-10T09:00:00+00:00'},
+        ]
+        schedule_deferred(deferred, 't', 'm', batch_id='batch-1')
+
+        self.assertEqual(apply_async.call_count, 2)
+        first = apply_async.call_args_list[0]
+        self.assertEqual(first.kwargs['eta'], utc(8))
+        self.assertEqual(first.kwargs['kwargs']['batch_id'], 'batch-1')
+        self.assertEqual(first.kwargs['kwargs']['emails'], ['a@example.com'])
+        self.assertEqual(first.kwargs['kwargs']['phones'], ['+79161234567'])
@@ -0,0 +1,50 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from notifications.profiling import is_active, profile_session
+from notifications.services.notification_service import NotificationService
+from notifications.tasks import send_single_message_task
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+
+    def test_sessions_with_same_name_do_not_overwrite(self):
+        with override_settings(NOTIFICATION_PROFILING_DIR=self.output_dir.name):
+            with profile_session('same') as first:
+                pass
+            with profile_session('same') as second:
+                pass
+
+        self.assertNotEqual(first['collapsed'], second['collapsed'])
+        self.assertNotEqual(first['stages'], second['stages'])
+
+    @override_settings(NOTIFICATION_PROFILING=True)
+    def test_global_flag_does_not_profile_service_calls(self):
+        with mock.patch('notifications.profiling.ProfileSession') as session:
+            NotificationService().send_single_message(title='t', message='m', email='a@example.com')
+
+        session.assert_not_called()
+        self.assertFalse(is_active())
+
+    def test_single_task_profiled_with_header(self):
+        with override_settings(NOTIFICATION_PROFILING_DIR=self.output_dir.name):
+            result = send_single_message_task.apply(
+                kwargs={'title': 't', 'message': 'm', 'email': 'a@example.com'}, headers={'profile': True}
+            ).get()
+
+        self.assertEqual(result['status'], 'success')
+        self.assertTrue(os.path.exists(result['profile']['collapsed']))
+        self.assertIn('send_single_message_task-', os.path.basename(result['profile']['stages']))
+
+    @override_settings(NOTIFICATION_PROFILING=False)
+    def test_single_task_not_profiled_by_default(self):
+        result = send_single_message_task.apply(kwargs={'title': 't', 'message': 'm', 'email': 'a@example.com'}).get()
+
+        self.assertEqual(result['status'], 'success')
+        self.assertNotIn('profile', result)
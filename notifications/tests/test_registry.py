@@ -0,0 +1,68 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from notifications.models import NotificationLog
+from notifications.serializers import SendBulkMessageSerializer
+from notifications.services.base import BaseSender
+from notifications.services.notification_service import NotificationService
+from notifications.services.registry import available_channels, get_sender
+
+
+class WhatsAppSender(BaseSender):
+    contact_field = 'phone'
+    sent = []
+
+    def send(self, destination, title, message):
+        self.sent.append(destination)
+        return True, f"wa-{destination}"
+
+
+class FaxSender(BaseSender):
+    contact_field = 'fax'
+
+    def send(self, destination, title, message):
+        return True, None
+
+
+PLUGINS = {'whatsapp': 'notifications.tests.test_registry.WhatsAppSender'}
+
+
+class RegistryTests(TestCase):
+    @override_settings(NOTIFICATION_SENDERS={'fax': 'notifications.tests.test_registry.FaxSender'})
+    def test_unknown_contact_field_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_sender('fax')
+
+    @override_settings(NOTIFICATION_SENDERS={'sms': None})
+    def test_disabled_channel(self):
+        self.assertIsNone(get_sender('sms'))
+        self.assertNotIn('sms', available_channels())
+
+    def test_senders_are_reset_on_settings_change(self):
+        with override_settings(NOTIFICATION_SENDERS=PLUGINS):
+            self.assertIsInstance(get_sender('whatsapp'), WhatsAppSender)
+        self.assertIsNone(get_sender('whatsapp'))
+
+
+@override_settings(NOTIFICATION_SENDERS=PLUGINS)
+class PluginChannelTests(TestCase):
+    def setUp(self):
+        WhatsAppSender.sent = []
+
+    def test_preferred_channel_accepts_plugin(self):
+        serializer = SendBulkMessageSerializer(data={
+            'title': 't', 'message': 'm', 'phones': ['+79161234567'], 'preferred_channel': 'whatsapp'
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_bulk_uses_preferred_plugin_for_its_contact_field(self):
+        results = NotificationService().send_bulk_message(
+            title='t', message='m', phones=['89161234567'], preferred_channel='whatsapp'
+        )
+        self.assertEqual(results['successful'], 1)
+        self.assertEqual(WhatsAppSender.sent, ['+79161234567'])
+        self.assertNotIn('sms', results)
+
+        log = NotificationLog.objects.get()
+        self.assertEqual((log.channel_used, log.phone), ('whatsapp', '+79161234567'))
+        self.assertEqual(log.get_channel_used_display(), 'whatsapp')
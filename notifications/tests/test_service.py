@@ -0,0 +1,46 @@
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from notifications.models import NotificationLog, RecipientProfile, SuppressionEntry
+from notifications.services.notification_service import NotificationService, Outcome
+from notifications.services.profiles import profile_cache
+from notifications.services.suppression import suppression_list
+
+
+@override_settings(NOTIFICATION_SENDERS={'sms': None})
+class CompactBulkSendTests(TestCase):
+    def setUp(self):
+        suppression_list.invalidate()
+        profile_cache.clear()
+        self.addCleanup(suppression_list.invalidate)
+        self.addCleanup(profile_cache.clear)
+
+    def test_every_recipient_is_logged_under_batch_id(self):
+        SuppressionEntry.objects.create(channel='email', contact='blocked@example.com')
+        RecipientProfile.objects.create(email='out@example.com', opted_out_channels=['email'])
+
+        results = NotificationService().send_bulk_message(
+            title='t',
+            message='m',
+            emails=['ok@example.com', 'blocked@example.com', 'out@example.com'],
+            phones=['+79161234567'],
+            batch_id='batch-1',
+            compact=True,
+        )
+
+        self.assertEqual(results['outcomes'], {
+            Outcome.SENT: 1, Outcome.SUPPRESSED: 1, Outcome.OPTED_OUT: 1, Outcome.UNSUPPORTED: 1,
+        })
+        self.assertEqual((results['successful'], results['failed'], results['skipped']), (1, 1, 2))
+        self.assertEqual(len(mail.outbox), 1)
+
+        logged = dict(
+            NotificationLog.objects.filter(batch_id='batch-1').values_list('outcome', 'status')
+        )
+        self.assertEqual(logged, {
+            Outcome.SENT: NotificationLog.Status.SENT,
+            Outcome.SUPPRESSED: NotificationLog.Status.SKIPPED,
+            Outcome.OPTED_OUT: NotificationLog.Status.SKIPPED,
+            Outcome.UNSUPPORTED: NotificationLog.Status.FAILED,
+        })
+        self.assertTrue(NotificationLog.objects.filter(outcome=Outcome.UNSUPPORTED, phone='+79161234567').exists())
@@ -0,0 +1,67 @@
+from django.test import SimpleTestCase
+
+from notifications.services.sms_encoding import (
+    FIT_TRANSLITERATE, FIT_TRUNCATE, GSM7, UCS2,
+    analyze, count_segments, detect_encoding, fit, transliterate, truncate,
+)
+
+
+class DetectEncodingTests(SimpleTestCase):
+    def test_gsm7_basic_and_extended(self):
+        self.assertEqual(detect_encoding('Hello {world} €'), GSM7)
+
+    def test_cyrillic_is_ucs2(self):
+        self.assertEqual(detect_encoding('Привет'), UCS2)
+
+
+class CountSegmentsTests(SimpleTestCase):
+    def test_single_segment_limits(self):
+        self.assertEqual(count_segments('a' * 160, GSM7), 1)
+        self.assertEqual(count_segments('a' * 161, GSM7), 2)
+        self.assertEqual(count_segments('я' * 70, UCS2), 1)
+        self.assertEqual(count_segments('я' * 71, UCS2), 2)
+
+    def test_extended_char_counts_twice(self):
+        info = analyze('{' * 80)
+        self.assertEqual(info.length, 160)
+        self.assertEqual(info.segments, 1)
+
+    def test_escape_pair_is_not_split_between_parts(self):
+        # 152 позиции + '{' (2 позиции) не помещаются в 153: пара уходит во вторую часть
+        text = 'a' * 152 + '{' + 'a' * 152
+        self.assertEqual(analyze(text).length, 306)
+        self.assertEqual(count_segments(text, GSM7), 3)
+
+    def test_surrogate_pair_is_not_split_between_parts(self):
+        text = 'я' * 66 + '😀' + 'я' * 66
+        self.assertEqual(count_segments(text, UCS2), 3)
+
+
+class TruncateTests(SimpleTestCase):
+    def test_single_segment(self):
+        self.assertEqual(truncate('a' * 200, 1), 'a' * 160)
+
+    def test_multipart_respects_escape_pairs(self):
+        text = 'a' * 152 + '{' + 'a' * 200
+        result = truncate(text, 2)
+        self.assertEqual(result, 'a' * 152 + '{' + 'a' * 151)
+        self.assertEqual(analyze(result).segments, 2)
+
+    def test_short_text_is_unchanged(self):
+        self.assertEqual(truncate('short', 2), 'short')
+
+
+class FitTests(SimpleTestCase):
+    def test_transliterate_switches_to_gsm7(self):
+        self.assertEqual(transliterate('Щука'), 'Shchuka')
+        info = fit('Привет', None, FIT_TRANSLITERATE)
+        self.assertEqual((info.text, info.encoding), ('Privet', GSM7))
+
+    def test_truncate_to_budget(self):
+        info = fit('я' * 200, 2, FIT_TRUNCATE)
+        self.assertEqual(info.segments, 2)
+        self.assertEqual(len(info.text), 134)
+
+    def test_without_mode_text_is_kept(self):
+        info = fit('я' * 200, 1)
+        self.assertEqual(info.segments, 3)
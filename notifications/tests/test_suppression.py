@@ -0,0 +1,50 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from notifications.models import SuppressionEntry
+from notifications.services.suppression import suppression_list
+
+
+class SuppressionNormalizationTests(TestCase):
+    def setUp(self):
+        suppression_list.invalidate()
+        self.addCleanup(suppression_list.invalidate)
+
+    def test_normalize_contact(self):
+        self.assertEqual(SuppressionEntry.normalize_contact('email', ' User@Example.COM '), 'user@example.com')
+        self.assertEqual(SuppressionEntry.normalize_contact('sms', '8 (916) 123-45-67'), '+79161234567')
+        self.assertEqual(SuppressionEntry.normalize_contact('telegram', ' 42 '), '42')
+
+    def test_entry_saved_as_typed_matches_send(self):
+        SuppressionEntry.objects.create(channel='sms', contact='89161234567')
+        self.assertTrue(suppression_list.contains('sms', '+79161234567'))
+        self.assertFalse(suppression_list.contains('sms', '+79160000000'))
+
+    def test_api_contact_filter_is_normalized(self):
+        SuppressionEntry.objects.create(channel='sms', contact='+79161234567')
+        SuppressionEntry.objects.create(channel='email', contact='a@example.com')
+        user = get_user_model().objects.create(username='api')
+        self.client.force_login(user)
+
+        url = reverse('suppression-list')
+        for query in ({'contact': '89161234567'}, {'contact': '8 916 123 45 67', 'channel': 'sms'}):
+            response = self.client.get(url, query)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            items = data['results'] if isinstance(data, dict) else data
+            self.assertEqual([item['contact'] for item in items], ['+79161234567'])
+
+        response = self.client.post(url, {'channel': 'sms', 'contact': '8-916-000-00-00'})
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['contact'], '+79160000000')
+
+    def test_api_duplicate_in_other_format_is_rejected(self):
+        self.client.force_login(get_user_model().objects.create(username='api'))
+        url = reverse('suppression-list')
+
+        response = self.client.post(url, {'channel': 'sms', 'contact': '+79160000000'})
+        self.assertEqual(response.status_code, 201, response.content)
+        response = self.client.post(url, {'channel': 'sms', 'contact': '89160000000'})
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(SuppressionEntry.objects.filter(channel='sms').count(), 1)
@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from notifications.renderers import EventStreamRenderer
+from notifications.services.notification_service import NotificationService
+
+
+class EventStreamRendererTests(SimpleTestCase):
+    def test_stream_body_is_passed_through(self):
+        self.assertEqual(EventStreamRenderer().render('data: 1\n\n'), 'data: 1\n\n')
+
+    def test_error_dict_is_rendered_as_event(self):
+        body = EventStreamRenderer().render({'detail': 'Not authenticated'})
+        self.assertEqual(body, b'event: error\ndata: {"detail": "Not authenticated"}\n\n')
+
+
+class TaskEventsViewTests(TestCase):
+    def test_unauthenticated_event_source_gets_error_event(self):
+        response = self.client.get(
+            reverse('task-events', args=['00000000-0000-0000-0000-000000000000']),
+            HTTP_ACCEPT='text/event-stream'
+        )
+        self.assertIn(response.status_code, (401, 403))
+        self.assertTrue(response.content.startswith(b'event: error\ndata: '))
+
+
+@override_settings(NOTIFICATION_SENDERS={'email': None})
+class ProgressCallbackTests(TestCase):
+    def test_zero_progress_every_disables_callback(self):
+        calls = []
+        results = NotificationService().send_bulk_message(
+            title='t', message='m', emails=['a@example.com'],
+            progress_callback=calls.append, progress_every=0
+        )
+        self.assertEqual(results['total_recipients'], 1)
+        self.assertEqual(calls, [])
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from notifications.serializers import SendBulkMessageSerializer, SendUserListMessageSerializer
+from notifications.validators import (
+    MAX_REPORTED_INDEXES, clean_email, clean_string, clean_user, error_report, validate_list,
+)
+
+
+class CleanersTests(SimpleTestCase):
+    def test_clean_string(self):
+        self.assertEqual(clean_string('  abc '), 'abc')
+        self.assertEqual(clean_string(12345), '12345')
+        self.assertIsNone(clean_string(True))
+        self.assertIsNone(clean_string('   '))
+        self.assertIsNone(clean_string('abcdef', max_length=5))
+
+    def test_clean_email(self):
+        self.assertEqual(clean_email(' User@Example.com '), 'User@Example.com')
+        for value in ('no-at', 'a@b', 'a@-b.com', 'a@b.c-', None, 'a' * 250 + '@x.com'):
+            self.assertIsNone(clean_email(value), value)
+
+    def test_clean_user(self):
+        self.assertEqual(clean_user({'email': 'a@b.ru', 'phone': ' 8916 '}), {'email': 'a@b.ru', 'phone': '8916'})
+        self.assertIsNone(clean_user({'email': 'bad'}))
+        self.assertIsNone(clean_user({'name': 'only name'}))
+        self.assertIsNone(clean_user('a@b.ru'))
+
+
+class ValidateListTests(SimpleTestCase):
+    def test_collects_invalid_indexes(self):
+        values, invalid = validate_list(['a@b.ru', 'bad', ' c@d.ru ', 5], clean_email)
+        self.assertEqual(values, ['a@b.ru', 'c@d.ru'])
+        self.assertEqual(invalid, [1, 3])
+
+    def test_error_report_is_bounded(self):
+        report = error_report(list(range(500)), 1000)
+        self.assertEqual(len(report['invalid_indexes']), MAX_REPORTED_INDEXES)
+        self.assertEqual((report['invalid_count'], report['total']), (500, 1000))
+
+
+class FastListFieldTests(SimpleTestCase):
+    def test_bulk_serializer_reports_indexes(self):
+        serializer = SendBulkMessageSerializer(data={
+            'title': 't', 'message': 'm', 'emails': ['a@b.ru', 'bad', 'c@d.ru'], 'phones': ['1' * 21]
+        })
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors['emails'], {'invalid_indexes': [1], 'invalid_count': 1, 'total': 3})
+        self.assertEqual(serializer.errors['phones'], {'invalid_indexes': [0], 'invalid_count': 1, 'total': 1})
+
+    def test_rejects_non_list(self):
+        serializer = SendBulkMessageSerializer(data={'title': 't', 'message': 'm', 'emails': 'a@b.ru'})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('emails', serializer.errors)
+
+    def test_user_list_is_cleaned(self):
+        serializer = SendUserListMessageSerializer(data={
+            'title': 't', 'message': 'm', 'users': [{'email': ' a@b.ru ', 'telegram_chat_id': 42}]
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data['users'], [{'email': 'a@b.ru', 'telegram_chat_id': '42'}])
+
+
+class FastListErrorResponseTests(TestCase):
+    def test_error_report_keeps_integers_in_response(self):
+        self.client.force_login(get_user_model().objects.create(username='api'))
+        response = self.client.post(
+            reverse('send-message-async'),
+            {'title': 't', 'message': 'm', 'emails': ['a@b.ru', 'bad']},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['emails'], {'invalid_indexes': [1], 'invalid_count': 1, 'total': 2})
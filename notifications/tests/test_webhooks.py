@@ -0,0 +1,76 @@
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notifications.models import NotificationLog
+from notifications.services.email_sender import EmailSender
+
+
+def make_log(provider_message_id, channel=NotificationLog.Channel.SMS):
+    return NotificationLog.create_log(
+        channel_used=channel,
+        status=NotificationLog.Status.SENT,
+        title='t',
+        message='m',
+        phone='+79161234567',
+        provider_message_id=provider_message_id,
+    )
+
+
+class ApplyDeliveryStatusesTests(TestCase):
+    def test_final_status_is_not_overwritten(self):
+        log = make_log('1')
+        DeliveryStatus = NotificationLog.DeliveryStatus
+
+        updated = NotificationLog.apply_delivery_statuses(
+            NotificationLog.Channel.SMS, [('1', DeliveryStatus.DELIVERED, None)]
+        )
+        self.assertEqual(updated, 1)
+
+        updated = NotificationLog.apply_delivery_statuses(
+            NotificationLog.Channel.SMS, [('1', DeliveryStatus.UNDELIVERED, 'late')]
+        )
+        self.assertEqual(updated, 0)
+        log.refresh_from_db()
+        self.assertEqual(log.delivery_status, DeliveryStatus.DELIVERED)
+        self.assertIsNone(log.error_message)
+
+
+@override_settings(NOTIFICATION_WEBHOOK_TOKEN='secret')
+class SMSRuWebhookTests(TestCase):
+    def setUp(self):
+        self.url = reverse('webhook-smsru') + '?token=secret'
+
+    def test_delivered_report(self):
+        log = make_log('000-1')
+        response = self.client.post(self.url, {'data[0]': 'sms_status\n000-1\n103\n'})
+        self.assertEqual(response.content, b'100')
+        log.refresh_from_db()
+        self.assertEqual(log.delivery_status, NotificationLog.DeliveryStatus.DELIVERED)
+
+    def test_non_string_values_are_ignored(self):
+        response = self.client.post(
+            self.url, {'data[0]': 5, 'data[1]': ['sms_status'], 'data[2]': None}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(self.url, [1, 2], content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_wrong_token_is_rejected(self):
+        response = self.client.post(reverse('webhook-smsru') + '?token=wrong', {})
+        self.assertIn(response.status_code, (401, 403))
+
+
+class EmailMessageIdTests(TestCase):
+    @override_settings(EMAIL_MESSAGE_ID_DOMAIN='mail.example.com')
+    def test_message_id_uses_configured_domain_and_is_logged(self):
+        success, message_id = EmailSender().send('a@example.com', 't', 'm')
+
+        self.assertTrue(success)
+        self.assertTrue(message_id.endswith('@mail.example.com>'))
+        self.assertEqual(mail.outbox[0].extra_headers['Message-ID'], message_id)
+        log = make_log(message_id, channel=NotificationLog.Channel.EMAIL)
+        self.assertEqual(NotificationLog.objects.get(id=log.id).provider_message_id, message_id)
+
+    def test_provider_message_id_fits_long_host_names(self):
+        self.assertGreaterEqual(NotificationLog._meta.get_field('provider_message_id').max_length, 255)
@@ -1,12 +1,27 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificationView, NotificationAsyncView, NotificationLogViewSet
+from .views import (
+    NotificationView,
+    NotificationAsyncView,
+    NotificationLogViewSet,
+    DeliveryStatusWebhookView,
+    SMSRuWebhookView,
+    TaskStatusView,
+    TaskEventsView,
+    SuppressionEntryViewSet
+)
 
 router = DefaultRouter()
 router.register(r'logs', NotificationLogViewSet, basename='log')
+router.register(r'suppressions', SuppressionEntryViewSet, basename='suppression')
 
 urlpatterns = [
     path('v1/send/', NotificationView.as_view(), name='send-message'),
     path('v1/send-async/', NotificationAsyncView.as_view(), name='send-message-async'),
+    path('v1/tasks/', TaskStatusView.as_view(), name='task-status-batch'),
+    path('v1/tasks/<str:task_id>/', TaskStatusView.as_view(), name='task-status'),
+    path('v1/tasks/<str:task_id>/events/', TaskEventsView.as_view(), name='task-events'),
+    path('v1/webhooks/delivery/', DeliveryStatusWebhookView.as_view(), name='webhook-delivery'),
+    path('v1/webhooks/smsru/', SMSRuWebhookView.as_view(), name='webhook-smsru'),
     path('v1/', include(router.urls)),
 ]
\ No newline at end of file
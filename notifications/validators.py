@@ -0,0 +1,90 @@
+import re
+
+
+# Упрощенный вариант django.core.validators.EmailValidator без IDN и кавычек в имени
+EMAIL_RE = re.compile(
+    r"^[-!#$%&'*+/=?^_`{}|~0-9a-z]+(?:\.[-!#$%&'*+/=?^_`{}|~0-9a-z]+)*"
+    r"@(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9-]{2,63}(?<!-)$",
+    re.IGNORECASE
+)
+EMAIL_MAX_LENGTH = 254
+
+# В отчете об ошибках перечисляется не больше этого числа индексов
+MAX_REPORTED_INDEXES = 100
+
+CONTACT_FIELDS = ('email', 'phone', 'telegram_chat_id')
+
+
+def clean_string(value, max_length=None):
+    """Строка без пробелов по краям (числа приводятся к строке) или None"""
+    if isinstance(value, str):
+        value = value.strip()
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    else:
+        return None
+    if not value or (max_length and len(value) > max_length):
+        return None
+    return value
+
+
+def clean_email(value):
+    """Email без пробелов по краям или None"""
+    value = clean_string(value, EMAIL_MAX_LENGTH)
+    if value is None or EMAIL_RE.match(value) is None:
+        return None
+    return value
+
+
+def make_string_cleaner(max_length):
+    def clean(value):
+        return clean_string(value, max_length)
+    return clean
+
+
+def clean_user(value, phone_max_length=20, chat_id_max_length=100):
+    """Словарь контактов пользователя или None, если есть некорректное поле или нет контактов"""
+    if not isinstance(value, dict):
+        return None
+    user = {}
+    for key, item in value.items():
+        if key == 'email':
+            item = clean_email(item)
+        elif key == 'phone':
+            item = clean_string(item, phone_max_length)
+        elif key == 'telegram_chat_id':
+            item = clean_string(item, chat_id_max_length)
+        else:
+            item = clean_string(item)
+        if item is None:
+            return None
+        user[key] = item
+    if not any(user.get(field) for field in CONTACT_FIELDS):
+        return None
+    return user
+
+
+def validate_list(values, clean):
+    """Проверить список за один проход
+
+    Возвращает (очищенные значения, индексы некорректных элементов).
+    """
+    cleaned = []
+    invalid = []
+    append = cleaned.append
+    for index, value in enumerate(values):
+        value = clean(value)
+        if value is None:
+            invalid.append(index)
+        else:
+            append(value)
+    return cleaned, invalid
+
+
+def error_report(invalid, total):
+    """Компактный отчет: только индексы некорректных элементов"""
+    return {
+        'invalid_indexes': invalid[:MAX_REPORTED_INDEXES],
+        'invalid_count': len(invalid),
+        'total': total,
+    }
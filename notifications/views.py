@@ -1,18 +1,34 @@
-from rest_framework import viewsets, status
+import json
+import time
+
+from celery.result import AsyncResult
+from django.conf import settings
+from django.db.models import Count, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import NotificationLog
+from .models import NotificationLog, SuppressionEntry, channel_choices
+from .permissions import WebhookTokenPermission
+from .renderers import EventStreamRenderer
 from .serializers import (
     SendSingleMessageSerializer, 
     SendBulkMessageSerializer,
     SendUserListMessageSerializer,
     NotificationLogSerializer,
-    BulkSendResultSerializer
+    BulkSendResultSerializer,
+    DeliveryStatusBatchSerializer,
+    TaskStatusBatchSerializer,
+    SuppressionEntrySerializer
 )
+from .services import outbox
 from .services.notification_service import NotificationService
-from .tasks import send_single_message_task, send_bulk_message_task
+from .services.registry import available_channels, get_sender
+from .services.suppression import suppression_list
+from .tasks import send_single_message_task, send_bulk_message_task, schedule_deferred
 
 
 class NotificationView(APIView):
@@ -34,6 +50,21 @@ class NotificationView(APIView):
         if serializer.is_valid():
             service = NotificationService()
 
+            # В тихие часы получателя отправка ставится в очередь на их окончание
+            resume_at = service.quiet_until(
+                email=serializer.validated_data.get('email'),
+                phone=serializer.validated_data.get('phone'),
+                telegram_chat_id=serializer.validated_data.get('telegram_chat_id')
+            )
+            if resume_at:
+                task_id = outbox.schedule(send_single_message_task, eta=resume_at, **serializer.validated_data)
+                return Response({
+                    'status': 'deferred',
+                    'task_id': task_id,
+                    'resume_at': resume_at.isoformat(),
+                    'type': 'single'
+                }, status=status.HTTP_202_ACCEPTED)
+
             success, result_message = service.send_single_message(
                 title=serializer.validated_data['title'],
                 message=serializer.validated_data['message'],
@@ -73,6 +104,12 @@ class NotificationView(APIView):
                 telegram_chat_ids=serializer.validated_data.get('telegram_chat_ids', []),
                 preferred_channel=serializer.validated_data.get('preferred_channel')
             )
+            results['deferred_task_ids'] = schedule_deferred(
+                results.pop('deferred'),
+                serializer.validated_data['title'],
+                serializer.validated_data['message'],
+                serializer.validated_data.get('preferred_channel')
+            )
 
             result_serializer = BulkSendResultSerializer(results)
             return Response({
@@ -110,6 +147,12 @@ class NotificationView(APIView):
                 telegram_chat_ids=telegram_chat_ids,
                 preferred_channel=serializer.validated_data.get('preferred_channel')
             )
+            results['deferred_task_ids'] = schedule_deferred(
+                results.pop('deferred'),
+                serializer.validated_data['title'],
+                serializer.validated_data['message'],
+                serializer.validated_data.get('preferred_channel')
+            )
 
             result_serializer = BulkSendResultSerializer(results)
             return Response({
@@ -128,30 +171,209 @@ class NotificationAsyncView(APIView):
         """Асинхронная отправка сообщения"""
         if any(key in request.data for key in ['emails', 'phones', 'telegram_chat_ids']):
             # Массовая отправка
-            task = send_bulk_message_task.delay(
-                title=request.data['title'],
-                message=request.data['message'],
-                emails=request.data.get('emails', []),
-                phones=request.data.get('phones', []),
-                telegram_chat_ids=request.data.get('telegram_chat_ids', []),
-                preferred_channel=request.data.get('preferred_channel')
-            )
+            serializer = SendBulkMessageSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            bulk_kwargs = {
+                'title': serializer.validated_data['title'],
+                'message': serializer.validated_data['message'],
+                'emails': serializer.validated_data.get('emails', []),
+                'phones': serializer.validated_data.get('phones', []),
+                'telegram_chat_ids': serializer.validated_data.get('telegram_chat_ids', []),
+                'preferred_channel': serializer.validated_data.get('preferred_channel'),
+            }
+            # Сегменты и стоимость SMS известны клиенту до начала отправки
+            sms_projection = NotificationService().project_bulk_sms(**bulk_kwargs)
+            task_id = outbox.schedule(send_bulk_message_task, **bulk_kwargs)
         else:
             # Отправка одному пользователю
-            task = send_single_message_task.delay(
-                title=request.data['title'],
-                message=request.data['message'],
-                email=request.data.get('email'),
-                phone=request.data.get('phone'),
-                telegram_chat_id=request.data.get('telegram_chat_id'),
-                preferred_channel=request.data.get('preferred_channel')
+            serializer = SendSingleMessageSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            sms_projection = None
+            task_id = outbox.schedule(
+                send_single_message_task,
+                title=serializer.validated_data['title'],
+                message=serializer.validated_data['message'],
+                email=serializer.validated_data.get('email'),
+                phone=serializer.validated_data.get('phone'),
+                telegram_chat_id=serializer.validated_data.get('telegram_chat_id'),
+                preferred_channel=serializer.validated_data.get('preferred_channel')
             )
 
-        return Response({
+        response = {
             'status': 'queued',
-            'task_id': task.id,
+            'task_id': task_id,
             'message': 'Сообщение поставлено в очередь на отправку'
-        })
+        }
+        if sms_projection:
+            response['sms'] = sms_projection
+        return Response(response)
+
+
+class TaskStatusView(APIView):
+    """Статус асинхронных задач отправки
+
+    Читается только состояние задачи в result backend Celery. Параметр wait
+    включает long-polling: ответ возвращается, когда задачи завершились или
+    истекло wait секунд (не больше NOTIFICATION_TASK_MAX_WAIT).
+    Неизвестный task_id имеет состояние PENDING.
+    """
+    POLL_INTERVAL = 0.5
+
+    def get(self, request, task_id):
+        """Статус одной задачи"""
+        wait = self._get_wait(request.query_params.get('wait'))
+        return Response(self._wait_for([task_id], wait)[0])
+
+    def post(self, request):
+        """Статусы нескольких задач: {"task_ids": [...], "wait": 0}"""
+        serializer = TaskStatusBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        wait = self._get_wait(serializer.validated_data['wait'])
+        return Response({'tasks': self._wait_for(serializer.validated_data['task_ids'], wait)})
+
+    @staticmethod
+    def get_status(task_id):
+        """Состояние, прогресс и (для завершенных) результат задачи"""
+        result = AsyncResult(task_id)
+        state = result.state
+        data = {'task_id': task_id, 'state': state, 'ready': state in ('SUCCESS', 'FAILURE', 'REVOKED')}
+        if state == 'PROGRESS':
+            data['progress'] = result.info
+        elif state == 'SUCCESS':
+            data['result'] = result.result
+        elif state == 'FAILURE':
+            data['error'] = str(result.result)
+        return data
+
+    def _get_wait(self, value):
+        try:
+            wait = float(value or 0)
+        except (TypeError, ValueError):
+            wait = 0
+        return max(0, min(wait, getattr(settings, 'NOTIFICATION_TASK_MAX_WAIT', 30)))
+
+    def _wait_for(self, task_ids, wait):
+        deadline = time.monotonic() + wait
+        statuses = {task_id: self.get_status(task_id) for task_id in task_ids}
+        while time.monotonic() < deadline:
+            pending = [task_id for task_id, data in statuses.items() if not data['ready']]
+            if not pending:
+                break
+            time.sleep(self.POLL_INTERVAL)
+            # Повторно опрашиваются только незавершенные задачи
+            for task_id in pending:
+                statuses[task_id] = self.get_status(task_id)
+        return [statuses[task_id] for task_id in task_ids]
+
+
+class TaskEventsView(APIView):
+    """Статус задачи в виде server-sent events
+
+    Событие отправляется при каждом изменении состояния или прогресса;
+    поток закрывается после завершения задачи или через NOTIFICATION_TASK_MAX_STREAM секунд.
+    """
+    renderer_classes = [EventStreamRenderer, JSONRenderer]
+    POLL_INTERVAL = 1
+
+    def get(self, request, task_id):
+        response = StreamingHttpResponse(self._events(task_id), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def _events(self, task_id):
+        deadline = time.monotonic() + getattr(settings, 'NOTIFICATION_TASK_MAX_STREAM', 300)
+        last = None
+        while True:
+            data = TaskStatusView.get_status(task_id)
+            if data != last:
+                yield f"event: status\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+                last = data
+            if data['ready'] or time.monotonic() >= deadline:
+                return
+            time.sleep(self.POLL_INTERVAL)
+
+
+class DeliveryStatusWebhookView(APIView):
+    """Прием пакетов статусов доставки и уведомлений о возврате (bounce)"""
+    authentication_classes = []
+    permission_classes = [WebhookTokenPermission]
+
+    def post(self, request):
+        serializer = DeliveryStatusBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        channel = serializer.validated_data['channel']
+        events = serializer.validated_data['events']
+        updated = NotificationLog.apply_delivery_statuses(
+            channel,
+            [(event['message_id'], event['status'], event.get('error') or None) for event in events]
+        )
+
+        # Адреса с постоянным возвратом попадают в список блокировки
+        bounced_ids = [
+            event['message_id'] for event in events
+            if event['status'] == NotificationLog.DeliveryStatus.BOUNCED
+        ]
+        sender = get_sender(channel)
+        if bounced_ids and sender and sender.contact_field:
+            contacts = NotificationLog.objects.filter(
+                channel_used=channel,
+                provider_message_id__in=bounced_ids,
+                delivery_status=NotificationLog.DeliveryStatus.BOUNCED
+            ).values_list(sender.contact_field, flat=True)
+            suppression_list.add_many(channel, contacts, SuppressionEntry.Reason.BOUNCED)
+
+        return Response({'status': 'success', 'updated': updated})
+
+
+class SMSRuWebhookView(APIView):
+    """Прием отчетов о доставке SMS в формате callback SMS.ru"""
+    authentication_classes = []
+    permission_classes = [WebhookTokenPermission]
+
+    # Коды статусов SMS.ru: 103 - доставлено, 104-108 и 150 - не доставлено
+    DELIVERED_CODES = {'103'}
+    UNDELIVERED_CODES = {
+        '104': 'Истекло время жизни сообщения',
+        '105': 'Удалено оператором',
+        '106': 'Сбой в телефоне',
+        '107': 'Не доставлено по неизвестной причине',
+        '108': 'Отклонено',
+        '150': 'Не найден маршрут доставки',
+    }
+
+    def post(self, request):
+        events = []
+        data = request.data if hasattr(request.data, 'items') else {}
+        for key, value in data.items():
+            if not key.startswith('data[') or not isinstance(value, str):
+                continue
+            lines = value.splitlines()
+            if len(lines) < 3 or lines[0] != 'sms_status':
+                continue
+            sms_id, code = lines[1], lines[2]
+            if code in self.DELIVERED_CODES:
+                events.append((sms_id, NotificationLog.DeliveryStatus.DELIVERED, None))
+            elif code in self.UNDELIVERED_CODES:
+                events.append((
+                    sms_id,
+                    NotificationLog.DeliveryStatus.UNDELIVERED,
+                    f"SMS не доставлено: {self.UNDELIVERED_CODES[code]}"
+                ))
+
+        if events:
+            NotificationLog.apply_delivery_statuses(NotificationLog.Channel.SMS, events)
+
+        # SMS.ru считает callback обработанным только при ответе "100"
+        return HttpResponse('100', content_type='text/plain')
 
 
 class NotificationLogViewSet(viewsets.ReadOnlyModelViewSet):
@@ -159,6 +381,14 @@ class NotificationLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = NotificationLog.objects.all()
     serializer_class = NotificationLogSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        for param in ('batch_id', 'outcome'):
+            value = self.request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(**{param: value})
+        return queryset
+
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Статистика отправки"""
@@ -166,22 +396,53 @@ class NotificationLogViewSet(viewsets.ReadOnlyModelViewSet):
             'total': NotificationLog.objects.count(),
             'sent': NotificationLog.objects.filter(status=NotificationLog.Status.SENT).count(),
             'failed': NotificationLog.objects.filter(status=NotificationLog.Status.FAILED).count(),
+            'skipped': NotificationLog.objects.filter(status=NotificationLog.Status.SKIPPED).count(),
             'by_channel': {
-                'email': {
-                    'total': NotificationLog.objects.filter(channel_used='email').count(),
-                    'sent': NotificationLog.objects.filter(channel_used='email', status='sent').count(),
-                    'failed': NotificationLog.objects.filter(channel_used='email', status='failed').count(),
-                },
-                'sms': {
-                    'total': NotificationLog.objects.filter(channel_used='sms').count(),
-                    'sent': NotificationLog.objects.filter(channel_used='sms', status='sent').count(),
-                    'failed': NotificationLog.objects.filter(channel_used='sms', status='failed').count(),
-                },
-                'telegram': {
-                    'total': NotificationLog.objects.filter(channel_used='telegram').count(),
-                    'sent': NotificationLog.objects.filter(channel_used='telegram', status='sent').count(),
-                    'failed': NotificationLog.objects.filter(channel_used='telegram', status='failed').count(),
+                channel: {
+                    'total': NotificationLog.objects.filter(channel_used=channel).count(),
+                    'sent': NotificationLog.objects.filter(channel_used=channel, status='sent').count(),
+                    'failed': NotificationLog.objects.filter(channel_used=channel, status='failed').count(),
                 }
-            }
+                for channel in available_channels()
+            },
+            'by_account': list(
+                NotificationLog.objects.exclude(provider_account=None)
+                .values('channel_used', 'provider_account')
+                .annotate(
+                    total=Count('id'),
+                    sent=Count('id', filter=Q(status=NotificationLog.Status.SENT)),
+                    failed=Count('id', filter=Q(status=NotificationLog.Status.FAILED)),
+                )
+                .order_by('channel_used', 'provider_account')
+            )
         }
-        return Response(stats)
\ No newline at end of file
+        return Response(stats)
+
+
+class SuppressionEntryViewSet(mixins.CreateModelMixin,
+                              mixins.DestroyModelMixin,
+                              viewsets.ReadOnlyModelViewSet):
+    """Список блокировки: контакты, на которые сообщения не отправляются"""
+    queryset = SuppressionEntry.objects.all()
+    serializer_class = SuppressionEntrySerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        for param in ('channel', 'reason'):
+            value = self.request.query_params.get(param)
+            if value:
+                queryset = queryset.filter(**{param: value})
+
+        contact = self.request.query_params.get('contact')
+        if contact:
+            channel = self.request.query_params.get('channel')
+            if channel:
+                queryset = queryset.filter(contact=SuppressionEntry.normalize_contact(channel, contact))
+            else:
+                # Без канала контакт ищется во всех вариантах нормализации
+                variants = {
+                    SuppressionEntry.normalize_contact(channel, contact)
+                    for channel, _ in channel_choices()
+                }
+                queryset = queryset.filter(contact__in=variants)
+        return queryset
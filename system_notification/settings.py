@@ -112,13 +112,84 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 SERVER_EMAIL = EMAIL_HOST_USER
+# Домен в Message-ID писем; по умолчанию - FQDN хоста
+EMAIL_MESSAGE_ID_DOMAIN = os.getenv('EMAIL_MESSAGE_ID_DOMAIN') or None
 
 SMSRU_API_ID = os.getenv('SMSRU_API_ID')
+# Несколько учетных записей через запятую; при пустом значении используется SMSRU_API_ID
+SMSRU_API_IDS = os.getenv('SMSRU_API_IDS', '')
+SMSRU_TIMEOUT = float(os.getenv('SMSRU_TIMEOUT', 10))
+SMS_MAX_SEGMENTS = int(os.getenv('SMS_MAX_SEGMENTS', 0)) or None
+SMS_FIT_MODE = os.getenv('SMS_FIT_MODE')
+SMS_SEGMENT_PRICE = os.getenv('SMS_SEGMENT_PRICE')
 
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
+# Несколько ботов через запятую; при пустом значении используется TELEGRAM_BOT_TOKEN
+TELEGRAM_BOT_TOKENS = os.getenv('TELEGRAM_BOT_TOKENS', '')
+TELEGRAM_TIMEOUT = float(os.getenv('TELEGRAM_TIMEOUT', 10))
+# Максимальная пауза бота (лимит, ошибки подряд), которую отправка выжидает; при большей получатель откладывается
+TELEGRAM_MAX_WAIT = float(os.getenv('TELEGRAM_MAX_WAIT', 30))
+
+# Сигнал для перечитывания настроек отправщиков без перезапуска
+NOTIFICATION_CONFIG_RELOAD_SIGNAL = 'SIGUSR2'
+# Файл, из которого по сигналу перечитываются токены, ключи, адреса и таймауты отправщиков
+NOTIFICATION_CONFIG_ENV_FILE = os.getenv('NOTIFICATION_CONFIG_ENV_FILE', os.path.join(BASE_DIR, '.env'))
+
+# Дополнительные каналы: {'whatsapp': 'path.to.WhatsAppSender'}; None отключает канал
+NOTIFICATION_SENDERS = {}
+NOTIFICATION_CHANNEL_PRIORITY = ['telegram', 'email', 'sms']
+
+NOTIFICATION_WEBHOOK_TOKEN = os.getenv('NOTIFICATION_WEBHOOK_TOKEN')
 
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND')
+# Время хранения результатов задач в секундах
+CELERY_RESULT_EXPIRES = int(os.getenv('CELERY_RESULT_EXPIRES', 86400))
+
+# Прогресс массовой задачи обновляется каждые N получателей
+NOTIFICATION_PROGRESS_EVERY = 100
+# Максимальное ожидание long-polling и длительность потока SSE для статуса задач, секунды.
+# Ожидающий клиент занимает поток WSGI-сервера на все это время; EventSource переподключается сам
+NOTIFICATION_TASK_MAX_WAIT = 30
+NOTIFICATION_TASK_MAX_STREAM = 60
+
+# Кеш профилей получателей в памяти процесса
+NOTIFICATION_PROFILE_CACHE_SIZE = 10000
+NOTIFICATION_PROFILE_CACHE_TTL = 300
+# Профили при массовой отправке загружаются чанками по N контактов
+NOTIFICATION_PROFILE_PREFETCH_CHUNK = 1000
+
+# Список блокировки в памяти: подгрузка новых записей и полная перезагрузка, секунды
+NOTIFICATION_SUPPRESSION_REFRESH = 30
+NOTIFICATION_SUPPRESSION_FULL_REFRESH = 3600
+
+# Асинхронные отправки пишутся в outbox и публикуются в брокер задачей relay_outbox_task.
+# Включайте только вместе с Celery beat: без него задачи остаются в таблице
+NOTIFICATION_USE_OUTBOX = os.getenv('NOTIFICATION_USE_OUTBOX', 'False') == 'True'
+NOTIFICATION_OUTBOX_BATCH_SIZE = 500
+NOTIFICATION_OUTBOX_MAX_BATCHES = 20
+
+CELERY_BEAT_SCHEDULE = {
+    'relay-notification-outbox': {
+        'task': 'notifications.tasks.relay_outbox_task',
+        'schedule': float(os.getenv('NOTIFICATION_OUTBOX_RELAY_INTERVAL', 1.0)),
+    },
+}
+
+# Админка для больших таблиц логов: оценка числа строк и поиск по индексам
+NOTIFICATION_ADMIN_FAST_MODE = os.getenv('NOTIFICATION_ADMIN_FAST_MODE', 'False') == 'True'
+# Ниже этой оценки выполняется точный COUNT
+NOTIFICATION_ADMIN_EXACT_COUNT_LIMIT = 100000
+
+# Сэмплирующее профилирование send_bulk_message_task и send_single_message_task (синхронные запросы к API не профилируются).
+# Для одной задачи можно включить заголовком: headers={'profile': True}
+NOTIFICATION_PROFILING = os.getenv('NOTIFICATION_PROFILING', 'False') == 'True'
+NOTIFICATION_PROFILING_INTERVAL = float(os.getenv('NOTIFICATION_PROFILING_INTERVAL', '0.005'))
+# По умолчанию - каталог notification_profiles во временной директории
+NOTIFICATION_PROFILING_DIR = os.getenv('NOTIFICATION_PROFILING_DIR') or None
+
+# Результат массовой задачи без details: счетчики и batch_id
+NOTIFICATION_COMPACT_TASK_RESULTS = os.getenv('NOTIFICATION_COMPACT_TASK_RESULTS', 'False') == 'True'
 
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {